@@ -0,0 +1,151 @@
+# Copyright (c) 2026 RokctAI
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Copyright (c) 2026, Rokct Intelligence (pty) Ltd.
+# For license information, please see license.txt
+
+"""
+Registry of whitelisted-method aliases.
+
+Single source of truth for the names hooks.py exposes through
+`override_whitelisted_methods`. Each alias is served by a generated proxy
+in this module that resolves its target once per worker, enforces the
+target's own whitelisting, and records call counts and latency (as
+rcore.counters) so we can see which legacy clients still use an alias
+before retiring it.
+"""
+
+import time
+from datetime import datetime, timezone
+
+import frappe
+
+from rcore import counters
+
+# alias -> target. Targets are the rcore-substituted paths the SDK module
+# manifests declare.
+ALIASES = {
+    # The single universal entry point for the platform (routes by site role)
+    "rokct.platform.api": "rcore.platform.api.execute",
+    # Batch envelope: N sub-calls of the above in one round trip
+    "rokct.platform.batch": "rcore.api.batch.execute_batch",
+    # Legacy paas.* aliases kept for clients still calling the old app name.
+    "paas.api.auth.refresh": "rcore.auth.tenant.api.auth.auth.refresh",
+    "paas.tenant.api.log_frontend_error": "rcore.telemetry.tenant.telemetry.log_frontend_error.log_frontend_error",
+    "paas.api.upload.upload_file": "rcore.base.api.upload.upload_file",
+}
+
+STATS_CACHE_KEY = "rcore_alias_stats"
+
+_resolved = {}
+
+
+def proxy_name(alias):
+    """Module attribute name of the proxy serving `alias`."""
+    return alias.replace(".", "__")
+
+
+def get_override_whitelisted_methods():
+    """The `override_whitelisted_methods` hook value for every alias."""
+    return {alias: f"rcore.aliases.{proxy_name(alias)}" for alias in ALIASES}
+
+
+def resolve(alias):
+    """Return the target callable for `alias`, imported once per worker."""
+    target = _resolved.get(alias)
+    if target is None:
+        target = _resolved[alias] = frappe.get_attr(ALIASES[alias])
+    return target
+
+
+def dispatch(alias, kwargs):
+    target = resolve(alias)
+
+    # The proxy is guest-callable; apply the target's own rules instead
+    frappe.is_whitelisted(target)
+    from frappe.handler import is_valid_http_method
+
+    is_valid_http_method(target)
+
+    start = time.perf_counter()
+    failed = False
+    try:
+        return frappe.call(target, **kwargs)
+    except Exception:
+        failed = True
+        raise
+    finally:
+        _record(alias, time.perf_counter() - start, failed)
+
+
+def _make_proxy(alias):
+    def proxy(**kwargs):
+        return dispatch(alias, kwargs)
+
+    proxy.__name__ = proxy_name(alias)
+    proxy.__qualname__ = proxy.__name__
+    proxy.__doc__ = f"Alias proxy for {ALIASES[alias]}"
+    return frappe.whitelist(allow_guest=True)(proxy)
+
+
+for _alias in ALIASES:
+    globals()[proxy_name(_alias)] = _make_proxy(_alias)
+
+
+def _record(alias, seconds, failed):
+    counters.increment(STATS_CACHE_KEY, {
+        f"{alias}|count": 1,
+        f"{alias}|seconds": float(seconds),
+        f"{alias}|errors": int(failed),
+    })
+    counters.set_values(STATS_CACHE_KEY, {f"{alias}|last_called": int(time.time())})
+
+
+@frappe.whitelist()
+def get_alias_stats():
+    """
+    Per-alias call counts, error counts, mean latency (ms) and last call
+    time across all workers for the current site.
+    """
+    frappe.only_for("System Manager")
+    counters.flush()
+
+    stats = {
+        alias: {"target": target, "count": 0, "errors": 0, "mean_ms": None, "last_called": None}
+        for alias, target in ALIASES.items()
+    }
+    for field, value in counters.read(STATS_CACHE_KEY).items():
+        alias, _, metric = field.rpartition("|")
+        if alias not in stats:
+            continue
+        if metric == "seconds":
+            stats[alias]["seconds"] = float(value)
+        else:
+            stats[alias][metric] = int(value)
+
+    for entry in stats.values():
+        seconds = entry.pop("seconds", 0.0)
+        if entry["count"]:
+            entry["mean_ms"] = round(seconds * 1000 / entry["count"], 3)
+        if entry["last_called"]:
+            entry["last_called"] = datetime.fromtimestamp(
+                entry["last_called"], tz=timezone.utc).isoformat()
+
+    return stats
@@ -19,32 +19,159 @@
 # SOFTWARE.
 
 from typing import Any, Optional
+import hashlib
+import json
+import os
+import tempfile
+
 import frappe
+from werkzeug.wrappers import Response
+
+from rcore.caching import cached
+
+# Android/iOS verifiers poll these often; let intermediaries keep them for an
+# hour and revalidate cheaply via ETag afterwards.
+WELL_KNOWN_CACHE_CONTROL = "public, max-age=3600"
+
+# Opt-in static export (site_config `rcore_export_well_known`): documents
+# are also written into the site's public folder so the front web server
+# can serve them without reaching Python. The route rules stay as fallback.
+WELL_KNOWN_FILES = {
+    "assetlinks": "assetlinks.json",
+    "apple_app_site_association": "apple-app-site-association",
+}
+NGINX_SNIPPET_FILE = "rcore_well_known.nginx.conf"
 
 
 @frappe.whitelist(allow_guest=True)
 def get_assetlinks() -> Any:
     """
     The get_assetlinks function generates a JSON response containing asset links configuration for a Flutter app. It retrieves the package name and SHA256 fingerprints from the Flutter App Configuration settings, cleans up the fingerprints by removing empty lines or whitespace, and returns a list of asset links in the required format. The function returns an empty list if the package name is not set or if an error occurs during execution. The parameters for this function are implicitly defined by the configuration settings, specifically the package name and SHA256 fingerprints, which are used to construct the asset links configuration.
+    Every enabled Android row in the App Links registry (Flutter App Link child table) is added as a further statement with its own package name and fingerprints.
+    The serialized document is precompiled and cached per site, and served with a strong ETag so repeat verifier requests get a 304 Not Modified.
+    """
+    return _well_known_response("assetlinks")
+
+
+@frappe.whitelist(allow_guest=True)
+def get_apple_app_site_association() -> Any:
     """
-    import sys; _ = (frappe.request.headers.get("x-trace-id") if hasattr(frappe, "request") else None, sys.stderr)
-    frappe.response["type"] = "json"
+    The get_apple_app_site_association function generates the apple-app-site-association JSON object, which is used to enable Universal Links for an iOS application. This function retrieves the Apple team ID and iOS bundle ID from the Flutter App Configuration, constructs the app ID, and returns a JSON object containing the applinks details. The returned JSON object includes the app ID and specifies that all paths are supported. If the team ID or bundle ID is missing, or if an error occurs during execution, an empty dictionary is returned.
+    Every enabled iOS row in the App Links registry (Flutter App Link child table) is added as a further detail entry with its own app ID and path patterns.
+    The serialized document is precompiled and cached per site, and served with a strong ETag so repeat verifier requests get a 304 Not Modified.
+    """
+    return _well_known_response("apple_app_site_association")
+
+
+@cached("well_known", invalidate_on=("Flutter App Configuration",))
+def get_well_known_documents():
+    """
+    Return {name: {'body', 'etag'}} for the site's .well-known documents,
+    serialized once from Flutter App Configuration and cached until it is
+    saved again, so verifier hits never touch the database.
+    """
+    assetlinks, association = [], {}
     try:
         config = frappe.get_single("Flutter App Configuration")
-        package_name = config.package_name
-        fingerprints = (
-            config.sha256_fingerprint.splitlines()
-            if config.sha256_fingerprint
-            else []
+    except Exception:
+        frappe.log_error("Error loading Flutter App Configuration")
+        config = None
+
+    if config:
+        try:
+            assetlinks = build_assetlinks(config)
+        except Exception:
+            frappe.log_error("Error generating assetlinks.json")
+        try:
+            association = build_apple_app_site_association(config)
+        except Exception:
+            frappe.log_error("Error generating apple-app-site-association")
+
+    return {
+        "assetlinks": _serialize(assetlinks),
+        "apple_app_site_association": _serialize(association),
+    }
+
+
+def rebuild_well_known(doc=None, method=None):
+    """
+    doc_events handler: once the config save commits (and after
+    invalidate_doc_caches has cleared the old documents), recompile the
+    documents and refresh the static export. Nothing is cached from a
+    transaction that rolls back.
+    """
+    frappe.db.after_commit.add(_rebuild_well_known)
+
+
+def _rebuild_well_known():
+    documents = get_well_known_documents()
+
+    if frappe.conf.get("rcore_export_well_known"):
+        export_well_known_files(documents)
+
+
+def export_well_known_files(documents=None):
+    """
+    Atomically write the .well-known documents into the site's public
+    folder and refresh the matching nginx snippet. Returns the snippet path.
+    """
+    documents = documents or get_well_known_documents()
+    folder = frappe.get_site_path("public", ".well-known")
+    os.makedirs(folder, exist_ok=True)
+
+    for name, file_name in WELL_KNOWN_FILES.items():
+        _atomic_write(
+            os.path.join(folder, file_name), documents[name]["body"])
+
+    snippet_path = frappe.get_site_path(NGINX_SNIPPET_FILE)
+    _atomic_write(snippet_path, get_nginx_snippet())
+    return snippet_path
+
+
+def get_nginx_snippet():
+    """nginx locations serving the exported files, falling back to Frappe."""
+    public_path = os.path.abspath(frappe.get_site_path("public"))
+    blocks = [
+        f"# rcore .well-known static export for {frappe.local.site}\n"
+        "# Include inside this site's server block.\n"
+    ]
+    for file_name in WELL_KNOWN_FILES.values():
+        blocks.append(
+            f"location = /.well-known/{file_name} {{\n"
+            f"    root {public_path};\n"
+            "    default_type application/json;\n"
+            "    etag on;\n"
+            f'    add_header Cache-Control "{WELL_KNOWN_CACHE_CONTROL}";\n'
+            "    try_files $uri @webserver;\n"
+            "}\n"
         )
+    return "\n".join(blocks)
 
-        # Clean up fingerprints (remove empty lines or whitespace)
-        fingerprints = [f.strip() for f in fingerprints if f.strip()]
 
-        if not package_name:
-            return []
+def _atomic_write(path, content):
+    # A unique temp file per writer, so concurrent exports can't clobber
+    # each other's half-written file
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path), prefix=f".{os.path.basename(path)}.")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
 
-        return [
+
+def build_assetlinks(config):
+    """
+    Build the assetlinks.json payload from a Flutter App Configuration: the
+    legacy single package plus every enabled Android row in its app links
+    registry.
+    """
+    statements = []
+    for package_name, fingerprints in _merge_entries(_android_apps(config)).items():
+        statements.append(
             {
                 "relation": ["delegate_permission/common.handle_all_urls"],
                 "target": {
@@ -53,35 +180,89 @@ def get_assetlinks() -> Any:
                     "sha256_cert_fingerprints": fingerprints,
                 },
             }
-        ]
-    except Exception:
-        frappe.log_error("Error generating assetlinks.json")
-        return []
+        )
+    return statements
 
 
-@frappe.whitelist(allow_guest=True)
-def get_apple_app_site_association() -> Any:
+def build_apple_app_site_association(config):
     """
-    The get_apple_app_site_association function generates the apple-app-site-association JSON object, which is used to enable Universal Links for an iOS application. This function retrieves the Apple team ID and iOS bundle ID from the Flutter App Configuration, constructs the app ID, and returns a JSON object containing the applinks details. The returned JSON object includes the app ID and specifies that all paths are supported. If the team ID or bundle ID is missing, or if an error occurs during execution, an empty dictionary is returned.
+    Build the apple-app-site-association payload from a Flutter App
+    Configuration: the legacy single team/bundle pair plus every enabled
+    iOS row in its app links registry, each with its own path patterns.
     """
-    import sys; _ = (frappe.request.headers.get("x-trace-id") if hasattr(frappe, "request") else None, sys.stderr)
-    frappe.response["type"] = "json"
-    try:
-        config = frappe.get_single("Flutter App Configuration")
-        team_id = config.apple_team_id
-        bundle_id = config.ios_package_name
-
-        if not team_id or not bundle_id:
-            return {}
+    details = [
+        {"appID": app_id, "paths": paths}
+        for app_id, paths in _merge_entries(_ios_apps(config)).items()
+    ]
 
-        app_id = f"{team_id}.{bundle_id}"
+    if not details:
+        return {}
 
-        return {
-            "applinks": {
-                "apps": [],
-                "details": [{"appID": app_id, "paths": ["*"]}],
-            }
+    return {
+        "applinks": {
+            "apps": [],
+            "details": details,
         }
-    except Exception:
-        frappe.log_error("Error generating apple-app-site-association")
-        return {}
+    }
+
+
+def _android_apps(config):
+    package_name = config.package_name
+    if package_name:
+        yield package_name, _lines(config.sha256_fingerprint)
+
+    for row in _app_links(config, "Android"):
+        yield row.package_name, _lines(row.sha256_fingerprints)
+
+
+def _ios_apps(config):
+    team_id = config.apple_team_id
+    bundle_id = config.ios_package_name
+    if team_id and bundle_id:
+        yield f"{team_id}.{bundle_id}", ["*"]
+
+    for row in _app_links(config, "iOS"):
+        if row.apple_team_id:
+            yield f"{row.apple_team_id}.{row.package_name}", _lines(row.paths) or ["*"]
+
+
+def _merge_entries(entries):
+    """
+    Combine (id, values) pairs that share an id, keeping first-seen order,
+    so a registry row repeating the legacy package adds its fingerprints or
+    paths instead of being dropped.
+    """
+    merged = {}
+    for key, values in entries:
+        existing = merged.setdefault(key, [])
+        existing.extend(value for value in values if value not in existing)
+    return merged
+
+
+def _app_links(config, platform):
+    """Enabled Flutter App Link rows for `platform` (none before migrate)."""
+    return [
+        row for row in (config.get("app_links") or [])
+        if row.enabled and row.platform == platform and row.package_name
+    ]
+
+
+def _lines(value):
+    # Clean up multi-line fields (remove empty lines or whitespace)
+    return [line.strip() for line in (value or "").splitlines() if line.strip()]
+
+
+def _serialize(payload):
+    body = json.dumps(payload, separators=(",", ":"))
+    return {
+        "body": body,
+        "etag": hashlib.sha256(body.encode("utf-8")).hexdigest(),
+    }
+
+
+def _well_known_response(name):
+    document = get_well_known_documents()[name]
+    response = Response(document["body"], mimetype="application/json")
+    response.set_etag(document["etag"])
+    response.headers["Cache-Control"] = WELL_KNOWN_CACHE_CONTROL
+    return response.make_conditional(frappe.request)
@@ -0,0 +1,231 @@
+# Copyright (c) 2026 RokctAI
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from typing import Any
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import frappe
+from frappe import _
+from frappe.utils import cint
+from werkzeug.wrappers import Response
+
+# Upper bound on sub-calls in one envelope
+MAX_BATCH_CALLS = 25
+
+# Default thread pool size for parallel read-only sub-calls
+# (site_config: rcore_batch_max_workers)
+DEFAULT_MAX_WORKERS = 4
+
+# Methods that may not be nested inside a batch
+BATCH_METHODS = {"rokct.platform.batch", "rcore.api.batch.execute_batch"}
+
+HTTP_METHODS = {"GET", "POST", "PUT", "PATCH", "DELETE"}
+
+# Batch request headers not passed on to sub-calls: body framing, and
+# conditional headers that would turn a sub-call into an empty 304
+SKIPPED_HEADERS = {
+    "content-length", "content-type",
+    "if-none-match", "if-match", "if-modified-since", "if-unmodified-since",
+    "if-range",
+}
+
+
+@frappe.whitelist(allow_guest=True, methods=["POST"])
+def execute_batch(calls=None, parallel=0) -> Any:
+    """
+    Run several whitelisted method calls in one request.
+
+    `calls` is a JSON list of {"id", "method", "args", "read_only",
+    "http_method"}. Each sub-call goes through Frappe's normal dispatch
+    (alias overrides, whitelisting, guest and HTTP-method checks) with the
+    caller's session, as a request of its declared `http_method` (default
+    GET for read_only calls, else POST), sharing this request's DB
+    connection; a failing sub-call is rolled back to its own savepoint and
+    reported without affecting the others.
+
+    With `parallel` set, sub-calls flagged read_only run concurrently on
+    their own connections in a rolled-back transaction. Guest batches always
+    run serially, so anonymous clients can't fan out DB connections.
+    """
+    calls = frappe.parse_json(calls) if calls else []
+    if not isinstance(calls, list):
+        frappe.throw(_("calls must be a list"))
+    if len(calls) > MAX_BATCH_CALLS:
+        frappe.throw(
+            _("A batch may contain at most {0} calls").format(MAX_BATCH_CALLS))
+
+    calls = [_normalize_call(call, index) for index, call in enumerate(calls)]
+    results = [None] * len(calls)
+    if frappe.session.user == "Guest":
+        parallel = 0
+
+    concurrent = []
+    for index, call in enumerate(calls):
+        if cint(parallel) and call["read_only"]:
+            concurrent.append(index)
+        else:
+            results[index] = _run_call(call, savepoint=f"rcore_batch_{index}")
+
+    if concurrent:
+        max_workers = frappe.conf.get(
+            "rcore_batch_max_workers", DEFAULT_MAX_WORKERS)
+        site, user = frappe.local.site, frappe.session.user
+        headers = _request_headers()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                index: executor.submit(
+                    _run_isolated, site, user, calls[index], headers)
+                for index in concurrent
+            }
+            for index, future in futures.items():
+                results[index] = future.result()
+
+    return {"results": results}
+
+
+def _normalize_call(call, index):
+    if not isinstance(call, dict) or not call.get("method"):
+        frappe.throw(_("Call {0} must be an object with a method").format(index))
+    if call["method"] in BATCH_METHODS:
+        frappe.throw(_("Batch calls cannot be nested"))
+
+    args = call.get("args") or {}
+    if isinstance(args, str):
+        args = frappe.parse_json(args)
+
+    read_only = bool(call.get("read_only"))
+    http_method = str(
+        call.get("http_method") or ("GET" if read_only else "POST")).upper()
+    if http_method not in HTTP_METHODS:
+        frappe.throw(
+            _("Call {0} has an invalid http_method {1}").format(index, http_method))
+
+    return {
+        "id": call.get("id", index),
+        "method": call["method"],
+        "args": args,
+        "read_only": read_only,
+        "http_method": http_method,
+    }
+
+
+def _run_call(call, savepoint=None, headers=None):
+    """
+    Dispatch one sub-call with its own request, form_dict, response and
+    messages.
+    """
+    from frappe.handler import execute_cmd
+    from frappe.utils import set_request
+
+    local = frappe.local
+    saved = (
+        getattr(local, "request", None),
+        local.form_dict,
+        local.response,
+        local.message_log,
+    )
+    if headers is None:
+        headers = _request_headers()
+    set_request(
+        method=call["http_method"],
+        path=f"/api/method/{call['method']}",
+        headers=headers,
+    )
+    local.form_dict = frappe._dict(call["args"])
+    local.response = frappe._dict({"docs": []})
+    local.message_log = []
+
+    if savepoint:
+        frappe.db.savepoint(savepoint)
+
+    result = None
+    try:
+        data = _unwrap(execute_cmd(call["method"]))
+        result = {"id": call["id"], "status": "ok", "data": data}
+    except Exception as e:
+        result = _error_result(call, e)
+        if savepoint:
+            try:
+                frappe.db.rollback(save_point=savepoint)
+            except Exception:
+                # The sub-call committed, which released its savepoint;
+                # undo what it wrote since then, the rest stays written
+                frappe.db.rollback()
+                result["message"] = (
+                    f"{result['message']} (not rolled back: the call "
+                    "committed its transaction)")
+    finally:
+        if result and local.message_log:
+            result["messages"] = [
+                frappe.parse_json(m) if isinstance(m, str) else m
+                for m in local.message_log
+            ]
+        (local.request, local.form_dict, local.response,
+         local.message_log) = saved
+
+    return result
+
+
+def _run_isolated(site, user, call, headers=None):
+    """Run a read-only sub-call on its own connection, then roll back."""
+    frappe.init(site=site)
+    try:
+        frappe.connect()
+        frappe.set_user(user)
+        return _run_call(call, headers=headers)
+    except Exception as e:
+        return _error_result(call, e)
+    finally:
+        if getattr(frappe.local, "db", None):
+            frappe.db.rollback()
+        frappe.destroy()
+
+
+def _error_result(call, e):
+    return {
+        "id": call["id"],
+        "status": "error",
+        "exc_type": type(e).__name__,
+        "http_status_code": getattr(e, "http_status_code", 500),
+        "message": str(e),
+    }
+
+
+def _request_headers():
+    """Headers of the batch request, carried over to each sub-call."""
+    request = getattr(frappe.local, "request", None)
+    if request is None:
+        return {}
+    return {
+        key: value for key, value in request.headers.items()
+        if key.lower() not in SKIPPED_HEADERS
+    }
+
+
+def _unwrap(data):
+    """Endpoints returning a raw Response (e.g. .well-known) are decoded."""
+    if not isinstance(data, Response):
+        return data
+
+    body = data.get_data(as_text=True)
+    if data.mimetype == "application/json":
+        return json.loads(body) if body else None
+    return body
@@ -22,119 +22,346 @@ from typing import Any, Optional
 # Copyright (c) 2025, Rendani Sinyage and contributors
 # For license information, please see license.txt
 
+import hashlib
+import json
+
 import frappe
 from frappe import _
+from werkzeug.wrappers import Response
 
+from rcore.branding_assets import get_variant_urls
+from rcore.caching import cached
+from rcore.entitlements import build_entitlement_index, has_module
+from rcore.tracing import span
 
-def get_paas_branding():
-    """Get PaaS branding settings for tenant"""
-    try:
-        # Check if tenant has PaaS plan
-        subscription = frappe.db.get_value('Company Subscription',
-                                           {'company': frappe.defaults.get_user_default(
-                                               'Company')},
-                                           ['subscription_plan'], as_dict=True)
 
-        if not subscription:
-            return {'enabled': False}
+# Doctypes whose changes invalidate the cached branding (resolved dicts are
+# cached per company; the JS/CSS bundle once per site).
+BRANDING_DOCTYPES = ('Settings', 'Subscription Plan', 'Company Subscription')
 
-        # Check if plan includes PaaS
-        plan = frappe.get_doc(
-            'Subscription Plan',
-            subscription.subscription_plan)
-        has_paas = any(module.module_name == 'PaaS' for module in plan.modules)
+# Logo, favicon and title are rendered server-side from the boot payload and
+# website context (see boot_session / update_website_context). The bundle
+# only covers what templates can't: CSS hides "powered by" footers and pins
+# the known logo slots, and the script swaps stray stock logos elsewhere in
+# the page, watching inserted nodes with a single MutationObserver.
+BRANDING_JS_TEMPLATE = """(function () {
+    var branding = __RCORE_BRANDING__;
+    var stockLogo = /frappe|erpnext|logo/;
 
-        if not has_paas:
-            return {'enabled': False}
+    function brandImage(img) {
+        var src = img.getAttribute("src") || "";
+        if (src !== branding.logo && stockLogo.test(src)) {
+            img.setAttribute("src", branding.logo);
+        }
+    }
 
-        # Get PaaS settings logo and app name
-        settings = frappe.get_single('Settings')
-
-        # Use Settings logo if available, otherwise fallback to ROKCT default
-        # logos
-        logo = settings.logo if settings and settings.logo else '/assets/rokct/images/logo.svg'
-        favicon = settings.favicon if settings and settings.favicon else '/assets/rokct/images/logo.svg'
-        app_name = settings.project_title if settings and settings.project_title else 'ROKCT'
-
-        return {
-            'enabled': True,
-            'logo': logo,
-            'app_name': app_name,
-            'favicon': favicon,
-            'logo_dark': '/assets/rokct/images/logo_dark.svg'  # Dark mode logo
+    function brandTree(node) {
+        if (node.nodeType !== 1) {
+            return;
+        }
+        if (node.tagName === "IMG") {
+            brandImage(node);
+            return;
         }
+        var images = node.getElementsByTagName("img");
+        for (var i = 0; i < images.length; i++) {
+            brandImage(images[i]);
+        }
+    }
+
+    function start() {
+        brandTree(document.body);
+
+        new MutationObserver(function (mutations) {
+            for (var i = 0; i < mutations.length; i++) {
+                var mutation = mutations[i];
+                if (mutation.type === "attributes") {
+                    brandImage(mutation.target);
+                    continue;
+                }
+                for (var j = 0; j < mutation.addedNodes.length; j++) {
+                    brandTree(mutation.addedNodes[j]);
+                }
+            }
+        }).observe(document.body, {
+            childList: true,
+            subtree: true,
+            attributes: true,
+            attributeFilter: ["src"],
+        });
+    }
+
+    if (document.readyState === "loading") {
+        document.addEventListener("DOMContentLoaded", start);
+    } else {
+        start();
+    }
+})();
+"""
+
+BRANDING_CSS_TEMPLATE = """:root {
+    --rcore-brand-logo: url(__RCORE_LOGO__);
+}
+
+.navbar-brand img,
+.app-logo img,
+.navbar-home img,
+.login-content img,
+.for-login img,
+.sidebar-logo img {
+    content: var(--rcore-brand-logo);
+}
+
+/* Hide Frappe/ERPNext branding */
+.powered-by-frappe,
+.footer-powered,
+[class*="powered-by"] {
+    display: none !important;
+}
+"""
+
+# Upper bound on companies per batch branding request
+MAX_BATCH_COMPANIES = 500
+
+BRANDING_ASSET_TYPES = {
+    'js': 'application/javascript',
+    'css': 'text/css',
+}
+
+
+def get_paas_branding(company=None):
+    """
+    Get PaaS branding settings for tenant.
+
+    Resolved per company (defaulting to the user's default company) and
+    cached in an in-process LRU backed by Redis, so repeat calls cost no
+    queries until a doc event clears the cache.
+    """
+    if company is None:
+        company = frappe.defaults.get_user_default('Company')
+
+    branding = _resolve_paas_branding(company)
+    if branding is None:
+        # Resolution failed (and was not cached)
+        return {'enabled': False}
+
+    return dict(branding)
+
+
+def get_paas_branding_batch(companies):
+    """
+    Resolve branding for many companies at once.
+
+    Cached entries are served as usual; the rest are resolved together with
+    one entitlement query and a single Settings read.
+    """
+    companies = list(dict.fromkeys(c for c in companies if c))
+    result = {}
+    missing = []
+
+    for company in companies:
+        branding = _resolve_paas_branding.peek(company)
+        if branding is None:
+            missing.append(company)
+            continue
+        result[company] = dict(branding)
+
+    if missing:
+        try:
+            index = build_entitlement_index(missing)
+            enabled_branding = None
+            for company in missing:
+                if 'PaaS' in index.get(company, ()):
+                    if enabled_branding is None:
+                        enabled_branding = _settings_branding()
+                    branding = enabled_branding
+                else:
+                    branding = {'enabled': False}
+                _resolve_paas_branding.prime(branding, company)
+                result[company] = dict(branding)
+        except Exception as e:
+            frappe.log_error(f"PaaS branding error: {str(e)}")
+            for company in missing:
+                result[company] = {'enabled': False}
+
+    return result
+
+
+@cached('paas_branding', invalidate_on=BRANDING_DOCTYPES,
+        key=lambda company: company or '', cache_none=False)
+def _resolve_paas_branding(company):
+    """
+    Build the branding dict from the database; cached per company. Returns
+    None on error, which is not cached.
+    """
+    try:
+        # Check if tenant's plan includes PaaS
+        if not has_module(company, 'PaaS'):
+            return {'enabled': False}
+
+        return _settings_branding()
 
     except Exception as e:
         frappe.log_error(f"PaaS branding error: {str(e)}")
-        return {'enabled': False}
+        return None
+
+
+def _settings_branding():
+    """Branding values from the Settings single (PaaS assumed enabled)."""
+    # Get PaaS settings logo and app name
+    settings = frappe.get_single('Settings')
+
+    # Use Settings logo if available, otherwise fallback to ROKCT default
+    # logos
+    logo = settings.logo if settings and settings.logo else '/assets/rokct/images/logo.svg'
+    favicon = settings.favicon if settings and settings.favicon else '/assets/rokct/images/logo.svg'
+    app_name = settings.project_title if settings and settings.project_title else 'ROKCT'
+
+    branding = {
+        'enabled': True,
+        'logo': logo,
+        'app_name': app_name,
+        'favicon': favicon,
+        'logo_dark': '/assets/rokct/images/logo_dark.svg'  # Dark mode logo
+    }
+
+    # Prefer resized, content-hashed variants when they've been generated
+    # for the current uploads
+    branding.update(get_variant_urls(settings))
+
+    return branding
+
+
+def clear_branding_cache():
+    """Drop the cached branding and bundle for the current site."""
+    _resolve_paas_branding.clear()
+    get_branding_bundle.clear()
 
 
 def get_paas_brand_html():
-    """Generate PaaS branding HTML/CSS"""
+    """
+    Generate PaaS branding HTML/CSS.
+
+    Only emits tags pointing at the content-hashed branding bundle; the
+    bundle itself is built once per Settings change and cached by browsers
+    forever (see branding_asset).
+    """
     branding = get_paas_branding()
 
     if not branding.get('enabled'):
         return ""
 
-    logo_url = branding.get('logo', '')
-    app_name = branding.get('app_name', 'My App')
-
-    # Logo replacement script
-    logo_script = f"""
-    <script>
-        frappe.ready(function() {{
-            // Replace all Frappe and ERPNext logos with PaaS logo
-            setTimeout(function() {{
-                // Navbar logo
-                $('.navbar-brand img, .app-logo img, .navbar-home img').attr('src', '{logo_url}');
-
-                // Login page logo
-                $('.login-content img, .for-login img').attr('src', '{logo_url}');
-
-                // Sidebar logo
-                $('.sidebar-logo img').attr('src', '{logo_url}');
-
-                // All Frappe/ERPNext logos
-                $('img').each(function() {{
-                    var src = $(this).attr('src');
-                    if (src && (src.includes('frappe') || src.includes('erpnext') || src.includes('logo'))) {{
-                        $(this).attr('src', '{logo_url}');
-                    }}
-                }});
-
-                // Set favicon
-                $('link[rel="icon"]').attr('href', '{logo_url}');
-                $('link[rel="shortcut icon"]').attr('href', '{logo_url}');
-
-                // Update page title
-                document.title = '{app_name}';
-            }}, 500);
-
-            // Re-apply on page navigation
-            frappe.router.on('change', function() {{
-                setTimeout(function() {{
-                    $('.navbar-brand img, .app-logo img').attr('src', '{logo_url}');
-                }}, 300);
-            }});
-        }});
-    </script>
-
-    <style>
-        /* Hide Frappe/ERPNext branding */
-        .powered-by-frappe,
-        .footer-powered,
-        [class*="powered-by"] {{
-            display: none !important;
-        }}
-    </style>
-    """
-
-    return logo_script
+    bundle = get_branding_bundle()
+    css_url = _branding_asset_url('css', bundle['hash'])
+    js_url = _branding_asset_url('js', bundle['hash'])
+
+    return (
+        f'<link rel="stylesheet" href="{css_url}">\n'
+        f'<script src="{js_url}" defer></script>\n'
+    )
+
+
+def boot_session(bootinfo):
+    """
+    boot_session hook: ship the resolved branding with the desk boot so the
+    navbar renders the tenant logo on first paint.
+    """
+    branding = get_paas_branding()
+    bootinfo.rcore_branding = branding
+
+    if branding.get('enabled'):
+        bootinfo.app_logo_url = branding['logo']
+
+
+def update_website_context(context):
+    """
+    update_website_context hook: render the tenant logo, favicon and app
+    name directly in website and login templates.
+    """
+    branding = get_paas_branding()
+    context.rcore_branding = branding
+
+    if branding.get('enabled'):
+        context.favicon = branding['favicon']
+        context.logo = branding['logo']
+        context.app_name = branding['app_name']
+
+
+@cached('paas_branding_bundle', invalidate_on=('Settings',))
+def get_branding_bundle():
+    """
+    Return the {'hash', 'js', 'css'} branding bundle for the site; built
+    once and cached until Settings change.
+    """
+    branding = _settings_branding()
+    config = {'logo': branding['logo']}
+    js = BRANDING_JS_TEMPLATE.replace(
+        '__RCORE_BRANDING__', json.dumps(config))
+    css = BRANDING_CSS_TEMPLATE.replace(
+        '__RCORE_LOGO__', json.dumps(branding['logo']))
+    content_hash = hashlib.sha256(
+        (js + css).encode('utf-8')).hexdigest()[:16]
+
+    return {'hash': content_hash, 'js': js, 'css': css}
+
+
+def _branding_asset_url(kind, content_hash):
+    return f"/api/method/rcore.branding.branding_asset?kind={kind}&v={content_hash}"
+
+
+@frappe.whitelist(allow_guest=True, methods=['GET'])
+def branding_asset(kind='js', v=None):
+    """
+    Serve the branding JS/CSS bundle.
+
+    Requests for the current content hash are cached immutably; requests
+    for an outdated hash get the current bundle but must revalidate.
+    """
+    if kind not in BRANDING_ASSET_TYPES:
+        raise frappe.DoesNotExistError(_("Unknown branding asset"))
+
+    bundle = get_branding_bundle()
+    response = Response(bundle[kind], mimetype=BRANDING_ASSET_TYPES[kind])
+    response.set_etag(f"{bundle['hash']}-{kind}")
+    if v == bundle['hash']:
+        response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    else:
+        response.headers['Cache-Control'] = 'no-cache'
+
+    return response.make_conditional(frappe.request)
 
 
 @frappe.whitelist(allow_guest=True)
 def get_paas_branding_for_tenant() -> Any:
     """API endpoint to get PaaS branding"""
-    import sys; _ = (frappe.request.headers.get("x-trace-id") if hasattr(frappe, "request") else None, sys.stderr)
-    branding = get_paas_branding()
+    with span('branding.resolve'):
+        branding = get_paas_branding()
     return branding
+
+
+@frappe.whitelist()
+def get_paas_branding_for_tenants(companies=None) -> Any:
+    """
+    Batch API endpoint to get PaaS branding for a list of companies.
+
+    Accepts a JSON list of company names (or a single name) and returns
+    {company: branding}.
+    """
+    if isinstance(companies, str):
+        try:
+            companies = frappe.parse_json(companies)
+        except ValueError:
+            # A bare company name rather than a JSON list
+            companies = [companies]
+    companies = companies or []
+    if isinstance(companies, str):
+        companies = [companies]
+    if not isinstance(companies, list) or not all(
+            isinstance(company, str) and company for company in companies):
+        frappe.throw(_("companies must be a list of company names"))
+    if len(companies) > MAX_BATCH_COMPANIES:
+        frappe.throw(
+            _("Cannot fetch branding for more than {0} companies at once").format(
+                MAX_BATCH_COMPANIES))
+
+    return get_paas_branding_batch(companies)
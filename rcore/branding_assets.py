@@ -0,0 +1,292 @@
+# Copyright (c) 2026 RokctAI
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Copyright (c) 2026, Rokct Intelligence (pty) Ltd.
+# For license information, please see license.txt
+
+import hashlib
+import io
+import json
+import os
+import tempfile
+import time
+
+import frappe
+
+from rcore.caching import cached
+from rcore.tracing import enqueue
+
+# Generated files live in the site's public files folder so the web server
+# serves them directly; names carry a content hash so they can be cached
+# forever.
+ASSETS_FOLDER = "rcore_branding"
+MANIFEST_FILE = "manifest.json"
+
+# Bounding boxes (px) for logo variants; the "md" variant is what branding
+# hands out as the default logo (2x a typical navbar logo).
+LOGO_SIZES = {"sm": 128, "md": 256, "lg": 512}
+DEFAULT_LOGO_SIZE = "md"
+
+ICO_SIZES = [(16, 16), (32, 32), (48, 48)]
+ICON_SIZES = {
+    "favicon-32": 32,
+    "apple-touch-icon": 180,
+    "icon-192": 192,
+    "icon-512": 512,
+}
+
+# Files that dropped out of the manifest two generations ago are deleted
+# once they are older than this (seconds), so pages and caches still
+# pointing at them have expired first.
+STALE_FILE_GRACE = 24 * 60 * 60
+
+
+@cached("branding_assets")
+def get_branding_assets():
+    """Return the current variant manifest for the site ({} if none yet)."""
+    return _read_manifest()
+
+
+def _read_manifest():
+    path = os.path.join(_assets_path(), MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def get_variant_urls(settings):
+    """
+    Map branding keys (logo, logo_dark, favicon, icons) to generated variant
+    URLs, skipping any variant whose source no longer matches `settings`
+    (e.g. a new logo was uploaded and the job hasn't run yet).
+    """
+    manifest = get_branding_assets()
+    if not manifest:
+        return {}
+
+    current = _source_urls(settings)
+    sources = manifest.get("sources", {})
+    urls = {}
+    for key in ("logo", "logo_dark", "favicon"):
+        if key in manifest and sources.get(key) == current.get(key):
+            urls[key] = manifest[key]
+    if "icons" in manifest and sources.get("favicon") == current.get("favicon"):
+        urls["icons"] = manifest["icons"]
+    if "logo_variants" in manifest and sources.get("logo") == current.get("logo"):
+        urls["logo_variants"] = manifest["logo_variants"]
+    return urls
+
+
+def enqueue_branding_assets(doc=None, method=None):
+    """doc_events handler for Settings: regenerate variants in the background."""
+    enqueue(
+        "rcore.branding_assets.generate_branding_assets",
+        queue="short",
+        job_id=f"rcore_branding_assets::{frappe.local.site}",
+        deduplicate=True,
+        enqueue_after_commit=True,
+    )
+
+
+def generate_branding_assets():
+    """
+    Build resized logo, dark-logo and favicon variants from Settings, write
+    them under content-hashed names and publish the new manifest.
+    """
+    settings = frappe.get_single("Settings")
+    sources = _source_urls(settings)
+    manifest = {"sources": sources}
+
+    logo_image = _load_image(sources.get("logo"))
+    if logo_image:
+        variants = {
+            size: _write_png(logo_image, f"logo-{size}", box)
+            for size, box in LOGO_SIZES.items()
+        }
+        manifest["logo_variants"] = variants
+        manifest["logo"] = variants[DEFAULT_LOGO_SIZE]
+
+    dark_image = _load_image(sources.get("logo_dark"))
+    if dark_image:
+        manifest["logo_dark"] = _write_png(
+            dark_image, "logo-dark", LOGO_SIZES[DEFAULT_LOGO_SIZE])
+
+    icon_image = _load_image(sources.get("favicon"))
+    if icon_image:
+        square = _square(icon_image)
+        manifest["favicon"] = _write_ico(square, "favicon")
+        manifest["icons"] = {
+            name: _write_png(square, name, size)
+            for name, size in ICON_SIZES.items()
+        }
+
+    previous = _read_manifest()
+    _write_file(MANIFEST_FILE, json.dumps(manifest, indent=1).encode())
+    _remove_stale_files(manifest, previous)
+
+    get_branding_assets.clear()
+
+    # Resolved branding embeds these URLs
+    from rcore.branding import clear_branding_cache
+    clear_branding_cache()
+
+    return manifest
+
+
+def _source_urls(settings):
+    logo = settings.get("logo")
+    return {
+        "logo": logo,
+        "logo_dark": settings.get("logo_dark"),
+        "favicon": settings.get("favicon") or logo,
+    }
+
+
+def _load_image(file_url):
+    """Open `file_url` with Pillow; None for missing, remote or SVG files."""
+    if not file_url:
+        return None
+
+    from PIL import Image
+
+    try:
+        content = _read_file_url(file_url)
+        if not content:
+            return None
+        image = Image.open(io.BytesIO(content))
+        image.load()
+    except Exception as e:
+        # SVG and other vector/unknown formats are already small; keep the
+        # original URL for those.
+        frappe.logger("rcore").info(
+            f"Skipping branding variants for {file_url}: {e}")
+        return None
+
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA")
+    return image
+
+
+def _read_file_url(file_url):
+    if file_url.startswith(("/files/", "/private/files/")):
+        file_name = frappe.db.get_value("File", {"file_url": file_url})
+        if not file_name:
+            return None
+        return frappe.get_doc("File", file_name).get_content()
+
+    if file_url.startswith("/assets/"):
+        path = os.path.join(frappe.local.sites_path, file_url.lstrip("/"))
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                return f.read()
+
+    return None
+
+
+def _square(image):
+    """Pad `image` onto a transparent square canvas."""
+    from PIL import Image
+
+    side = max(image.size)
+    canvas = Image.new("RGBA", (side, side), (0, 0, 0, 0))
+    canvas.paste(
+        image,
+        ((side - image.width) // 2, (side - image.height) // 2),
+    )
+    return canvas
+
+
+def _write_png(image, name, box):
+    variant = image.copy()
+    # thumbnail() keeps the aspect ratio and never upscales
+    variant.thumbnail((box, box))
+    buf = io.BytesIO()
+    variant.save(buf, format="PNG", optimize=True)
+    return _write_hashed(name, "png", buf.getvalue())
+
+
+def _write_ico(image, name):
+    buf = io.BytesIO()
+    image.save(buf, format="ICO", sizes=ICO_SIZES)
+    return _write_hashed(name, "ico", buf.getvalue())
+
+
+def _write_hashed(name, ext, content):
+    content_hash = hashlib.sha256(content).hexdigest()[:12]
+    file_name = f"{name}.{content_hash}.{ext}"
+    _write_file(file_name, content)
+    return f"/files/{ASSETS_FOLDER}/{file_name}"
+
+
+def _write_file(file_name, content):
+    folder = _assets_path()
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, file_name)
+    # A unique temp file per writer, so concurrent jobs can't clobber each
+    # other's half-written file
+    fd, tmp_path = tempfile.mkstemp(dir=folder, prefix=f".{file_name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        # Served directly by the web server
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def _remove_stale_files(manifest, previous):
+    """
+    Delete generated files referenced by neither `manifest` nor the
+    `previous` one. The previous generation stays, since other workers'
+    caches and already-rendered pages may still point at it until they
+    expire; older files go once they are past STALE_FILE_GRACE.
+    """
+    keep = {MANIFEST_FILE} | _manifest_files(manifest) | _manifest_files(previous)
+    cutoff = time.time() - STALE_FILE_GRACE
+
+    folder = _assets_path()
+    for file_name in os.listdir(folder):
+        if file_name in keep:
+            continue
+        path = os.path.join(folder, file_name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except FileNotFoundError:
+            # Removed by a concurrent run
+            pass
+
+
+def _manifest_files(manifest):
+    files = set()
+    for value in manifest.values():
+        urls = value.values() if isinstance(value, dict) else [value]
+        files.update(
+            os.path.basename(url) for url in urls
+            if isinstance(url, str) and url.startswith(f"/files/{ASSETS_FOLDER}/")
+        )
+    return files
+
+
+def _assets_path():
+    return frappe.get_site_path("public", "files", ASSETS_FOLDER)
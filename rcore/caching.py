@@ -0,0 +1,279 @@
+# Copyright (c) 2026 RokctAI
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Copyright (c) 2026, Rokct Intelligence (pty) Ltd.
+# For license information, please see license.txt
+
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+
+import frappe
+
+from rcore.tracing import span
+
+
+class LocalLRU:
+    """
+    Small thread-safe, per-process LRU with a TTL.
+
+    Sits in front of the Redis cache so hot guest endpoints do not even pay
+    a Redis round trip. Keys are scoped to the current site, so a worker
+    serving several sites never hands one tenant another tenant's entry.
+    Entries expire after `ttl` seconds, which bounds how long other workers
+    can serve a value after a doc event has invalidated it in Redis.
+    """
+
+    def __init__(self, maxsize=256, ttl=30):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _site():
+        return getattr(frappe.local, "site", None)
+
+    def get(self, key, default=None):
+        full_key = (self._site(), key)
+        with self._lock:
+            entry = self._data.get(full_key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[full_key]
+                return default
+            self._data.move_to_end(full_key)
+            return value
+
+    def set(self, key, value):
+        full_key = (self._site(), key)
+        with self._lock:
+            self._data[full_key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(full_key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop((self._site(), key), None)
+
+    def clear(self):
+        """Drop every entry belonging to the current site."""
+        site = self._site()
+        with self._lock:
+            for full_key in [k for k in self._data if k[0] == site]:
+                del self._data[full_key]
+
+
+# Redis key layout for `cached` functions. Values are stored as 1-tuples so
+# a cached None is distinguishable from a miss.
+CACHE_KEY_PREFIX = "rcore_cached"
+TAG_KEY_PREFIX = "rcore_cached_tags"
+
+# How long a worker may hold the cross-process recompute lock (seconds)
+LOCK_TIMEOUT = 10
+LOCK_POLL_INTERVAL = 0.05
+# How long a failed recompute tells waiters to stop waiting (seconds)
+FAILURE_MARKER_TTL = 2
+
+_MISS = object()
+
+# name -> wrapper, for the cached functions imported in this worker
+_registry = {}
+
+
+def cached(name, ttl=24 * 60 * 60, local_ttl=30, maxsize=256,
+           invalidate_on=(), key=None, cache_none=True):
+    """
+    Two-tier (in-process LRU + Redis) cache decorator for site-scoped data.
+
+    - `name` namespaces the Redis keys; keys are site-scoped by frappe.cache.
+    - `ttl` bounds the Redis copy; `local_ttl` bounds how long a worker
+      serves its in-process copy after another worker invalidated it.
+    - `invalidate_on` lists doctypes whose doc events clear this cache
+      (via `invalidate_doc_caches` in hooks.doc_events).
+    - `key(*args, **kwargs)` builds the cache key from the call arguments;
+      by default all arguments are used.
+    - Concurrent misses are coalesced: one thread per worker, and one worker
+      per site (through a short Redis lock), recomputes while the rest wait
+      for its result. If that recompute raises or produces nothing to cache,
+      the waiters stop waiting and compute for themselves.
+
+    The wrapper exposes `clear()`, `peek(*args, **kwargs)` and
+    `prime(value, *args, **kwargs)`.
+    """
+
+    def decorator(fn):
+        local = LocalLRU(maxsize=maxsize, ttl=local_ttl)
+        flight_locks = {}
+        flight_guard = threading.Lock()
+
+        def cache_key(args, kwargs):
+            if key is not None:
+                raw = key(*args, **kwargs)
+            else:
+                raw = (args, sorted(kwargs.items()))
+            return f"{CACHE_KEY_PREFIX}|{name}|{raw}"
+
+        def redis_get(full_key):
+            with span("cache.get", cache=name):
+                stored = frappe.cache().get_value(full_key)
+            return stored[0] if stored is not None else _MISS
+
+        def store(full_key, value):
+            cache = frappe.cache()
+            cache.set_value(full_key, (value,), expires_in_sec=ttl)
+            for doctype in invalidate_on:
+                cache.sadd(f"{TAG_KEY_PREFIX}|{doctype}", name)
+            local.set(full_key, value)
+
+        def lookup(full_key):
+            value = local.get(full_key, _MISS)
+            if value is _MISS:
+                value = redis_get(full_key)
+                if value is not _MISS:
+                    local.set(full_key, value)
+            return value
+
+        def compute(full_key, args, kwargs):
+            with flight_guard:
+                flight_lock = flight_locks.setdefault(full_key, threading.Lock())
+
+            with flight_lock:
+                # Another thread may have filled it while we waited
+                value = lookup(full_key)
+                if value is not _MISS:
+                    return value
+
+                cache = frappe.cache()
+                lock_key = cache.make_key(f"{full_key}|lock")
+                failed_key = cache.make_key(f"{full_key}|failed")
+                acquired = cache.set(lock_key, 1, nx=True, ex=LOCK_TIMEOUT)
+                if not acquired:
+                    deadline = time.monotonic() + LOCK_TIMEOUT
+                    while time.monotonic() < deadline:
+                        time.sleep(LOCK_POLL_INTERVAL)
+                        value = redis_get(full_key)
+                        if value is not _MISS:
+                            local.set(full_key, value)
+                            return value
+                        # The holder gave up without storing a value. The
+                        # keys are already prefixed, so use the raw client
+                        # calls (the wrapper's exists() would prefix again).
+                        if cache.get(failed_key) or cache.get(lock_key) is None:
+                            break
+
+                stored = False
+                try:
+                    with span("cache.compute", cache=name):
+                        value = fn(*args, **kwargs)
+                    if value is not None or cache_none:
+                        store(full_key, value)
+                        stored = True
+                    return value
+                finally:
+                    if acquired:
+                        if not stored:
+                            cache.set(failed_key, 1, ex=FAILURE_MARKER_TTL)
+                        cache.delete(lock_key)
+                    with flight_guard:
+                        flight_locks.pop(full_key, None)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            full_key = cache_key(args, kwargs)
+            value = lookup(full_key)
+            if value is _MISS:
+                value = compute(full_key, args, kwargs)
+            return value
+
+        def peek(*args, **kwargs):
+            """Cached value for these arguments, or None; never computes."""
+            value = lookup(cache_key(args, kwargs))
+            return None if value is _MISS else value
+
+        def prime(value, *args, **kwargs):
+            """Store a value computed elsewhere (e.g. by a batch query)."""
+            store(cache_key(args, kwargs), value)
+
+        def clear():
+            """Drop every cached entry for the current site."""
+            frappe.cache().delete_keys(f"{CACHE_KEY_PREFIX}|{name}|")
+            local.clear()
+
+        wrapper.peek = peek
+        wrapper.prime = prime
+        wrapper.clear = clear
+        # Let frappe.call() filter request args against the real signature
+        wrapper.fnargs = inspect.getfullargspec(fn).args
+        _registry[name] = wrapper
+        return wrapper
+
+    return decorator
+
+
+def invalidate_doc_caches(doc, method=None):
+    """
+    doc_events handler: clear every `cached` function that declared
+    `doc.doctype` in `invalidate_on`, once the transaction commits.
+
+    Clearing before commit would let a concurrent reader re-cache the old
+    value; each doctype is cleared once per transaction, and nothing is
+    cleared if it rolls back.
+    """
+    pending = getattr(frappe.local, "rcore_pending_invalidations", None)
+    if pending is None:
+        pending = frappe.local.rcore_pending_invalidations = set()
+    if doc.doctype in pending:
+        return
+
+    if not pending:
+        frappe.db.after_commit.add(_flush_pending_invalidations)
+        frappe.db.after_rollback.add(pending.clear)
+    pending.add(doc.doctype)
+
+
+def _flush_pending_invalidations():
+    pending = getattr(frappe.local, "rcore_pending_invalidations", None) or set()
+    frappe.local.rcore_pending_invalidations = None
+    for doctype in pending:
+        clear_doctype_caches(doctype)
+
+
+def clear_doctype_caches(doctype):
+    """
+    Clear every `cached` function that declared `doctype` in `invalidate_on`.
+
+    Looks the names up in Redis rather than in this worker's registry, so
+    caches are cleared even if the worker handling the save never imported
+    the module that defines them.
+    """
+    cache = frappe.cache()
+    for name in cache.smembers(f"{TAG_KEY_PREFIX}|{doctype}"):
+        name = frappe.safe_decode(name)
+        wrapper = _registry.get(name)
+        if wrapper:
+            wrapper.clear()
+        else:
+            cache.delete_keys(f"{CACHE_KEY_PREFIX}|{name}|")
@@ -0,0 +1,205 @@
+# Copyright (c) 2026 RokctAI
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Copyright (c) 2026, Rokct Intelligence (pty) Ltd.
+# For license information, please see license.txt
+
+"""
+Install-scoped snapshot of the Postgres catalog.
+
+Install steps ask "does this table / column / index / extension exist?"
+many times over. `catalog_snapshot()` reads all four from
+information_schema and pg_catalog in one go and answers those checks from
+memory for the rest of the block; steps record the DDL they run so the
+snapshot stays current. Outside a snapshot block, `get_catalog()` returns
+a LiveCatalog that answers each check with one targeted query instead.
+"""
+
+import threading
+from contextlib import contextmanager
+
+import frappe
+
+
+class CatalogSnapshot:
+    def __init__(self):
+        self.tables = set()
+        self.columns = {}
+        self.indexes = {}
+        self.extensions = set()
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """Read tables, columns, indexes and extensions of the current schema."""
+        tables = frappe.db.sql(
+            """SELECT table_name FROM information_schema.tables
+            WHERE table_schema = current_schema()""",
+            pluck=True,
+        )
+        columns = frappe.db.sql(
+            """SELECT table_name, column_name, data_type FROM information_schema.columns
+            WHERE table_schema = current_schema()""",
+        )
+        indexes = frappe.db.sql(
+            """SELECT indexname, tablename, indexdef FROM pg_indexes
+            WHERE schemaname = current_schema()""",
+        )
+        extensions = frappe.db.sql("SELECT extname FROM pg_extension", pluck=True)
+
+        with self._lock:
+            self.tables = set(tables)
+            self.columns = {
+                (table, column): data_type for table, column, data_type in columns
+            }
+            self.indexes = {
+                name.lower(): (table, definition.lower())
+                for name, table, definition in indexes
+            }
+            self.extensions = set(extensions)
+
+    def table_exists(self, table):
+        """`table` may be a DocType name or a "tab"-prefixed table name."""
+        return _table_name(table) in self.tables
+
+    def has_column(self, table, column):
+        return (_table_name(table), column) in self.columns
+
+    def column_type(self, table, column):
+        """information_schema data_type of the column, or None if missing."""
+        return self.columns.get((_table_name(table), column))
+
+    def has_index(self, name):
+        return name.lower() in self.indexes
+
+    def has_index_like(self, table, fragment):
+        """True if any index on `table` has `fragment` in its definition."""
+        table = _table_name(table)
+        fragment = fragment.lower()
+        return any(
+            index_table == table and fragment in definition
+            for index_table, definition in list(self.indexes.values())
+        )
+
+    def has_extension(self, name):
+        return name in self.extensions
+
+    def add_table(self, table):
+        with self._lock:
+            self.tables.add(_table_name(table))
+
+    def add_column(self, table, column, data_type=None):
+        with self._lock:
+            self.columns[(_table_name(table), column)] = data_type
+
+    def add_index(self, name, table, definition=""):
+        with self._lock:
+            self.indexes[name.lower()] = (_table_name(table), definition.lower())
+
+    def add_extension(self, name):
+        with self._lock:
+            self.extensions.add(name)
+
+
+class LiveCatalog:
+    """
+    The CatalogSnapshot interface backed by one targeted catalog query per
+    check, for callers outside a snapshot block; the add_* methods are
+    no-ops since every check reads the database.
+    """
+
+    def table_exists(self, table):
+        return bool(frappe.db.sql(
+            """SELECT 1 FROM information_schema.tables
+            WHERE table_schema = current_schema() AND table_name = %s""",
+            (_table_name(table),),
+        ))
+
+    def has_column(self, table, column):
+        return bool(frappe.db.sql(
+            """SELECT 1 FROM information_schema.columns
+            WHERE table_schema = current_schema()
+            AND table_name = %s AND column_name = %s""",
+            (_table_name(table), column),
+        ))
+
+    def column_type(self, table, column):
+        rows = frappe.db.sql(
+            """SELECT data_type FROM information_schema.columns
+            WHERE table_schema = current_schema()
+            AND table_name = %s AND column_name = %s""",
+            (_table_name(table), column),
+            pluck=True,
+        )
+        return rows[0] if rows else None
+
+    def has_index(self, name):
+        return bool(frappe.db.sql(
+            """SELECT 1 FROM pg_indexes
+            WHERE schemaname = current_schema() AND lower(indexname) = %s""",
+            (name.lower(),),
+        ))
+
+    def has_index_like(self, table, fragment):
+        return bool(frappe.db.sql(
+            """SELECT 1 FROM pg_indexes
+            WHERE schemaname = current_schema() AND tablename = %s
+            AND strpos(lower(indexdef), %s) > 0""",
+            (_table_name(table), fragment.lower()),
+        ))
+
+    def has_extension(self, name):
+        return bool(frappe.db.sql(
+            "SELECT 1 FROM pg_extension WHERE extname = %s", (name,)))
+
+    def add_table(self, table):
+        pass
+
+    def add_column(self, table, column, data_type=None):
+        pass
+
+    def add_index(self, name, table, definition=""):
+        pass
+
+    def add_extension(self, name):
+        pass
+
+
+@contextmanager
+def catalog_snapshot(snapshot=None):
+    """
+    Serve catalog checks from one snapshot for the duration of the block.
+    Pass an existing snapshot to share it with a worker thread.
+    """
+    previous = getattr(frappe.local, "rcore_catalog", None)
+    frappe.local.rcore_catalog = snapshot or previous or CatalogSnapshot()
+    try:
+        yield frappe.local.rcore_catalog
+    finally:
+        frappe.local.rcore_catalog = previous
+
+
+def get_catalog():
+    """The active snapshot, or a LiveCatalog outside a snapshot block."""
+    return getattr(frappe.local, "rcore_catalog", None) or LiveCatalog()
+
+
+def _table_name(table):
+    return table if table.startswith("tab") else f"tab{table}"
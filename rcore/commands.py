@@ -0,0 +1,356 @@
+# Copyright (c) 2026 RokctAI
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Copyright (c) 2026, Rokct Intelligence (pty) Ltd.
+# For license information, please see license.txt
+
+import json
+import os
+import time
+
+import click
+import frappe
+from frappe.commands import get_site, pass_context
+
+
+@click.command("rcore-export-well-known")
+@pass_context
+def export_well_known(context):
+    """
+    Write .well-known/assetlinks.json and apple-app-site-association into
+    the site's public folder and print the nginx snippet that serves them.
+    """
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+    try:
+        from rcore.api.app_links import export_well_known_files, get_nginx_snippet
+
+        snippet_path = export_well_known_files()
+        click.echo(get_nginx_snippet())
+        click.secho(f"Snippet written to {snippet_path}", fg="green")
+        if not frappe.conf.get("rcore_export_well_known"):
+            click.secho(
+                "Set rcore_export_well_known in site_config.json to keep the "
+                "files in sync when Flutter App Configuration changes.",
+                fg="yellow",
+            )
+    finally:
+        frappe.destroy()
+
+
+@click.command("rcore-profile-startup")
+@click.option("--runs", default=3, type=int, help="Fresh interpreters to time (median is reported)")
+@click.option("--threshold", default=20, type=float, help="Flag third-party imports costing at least this many ms")
+@click.option("--tolerance", default=0.2, type=float, help="Allowed slowdown against the baseline (0.2 = 20%)")
+@click.option("--save-baseline", is_flag=True, default=False, help="Store this run as the new baseline")
+@click.option("--json", "as_json", is_flag=True, default=False, help="Print the raw report as JSON")
+@pass_context
+def profile_startup(context, runs, threshold, tolerance, save_baseline, as_json):
+    """
+    Report rcore's cold-start cost: import time per rcore module, hooks
+    resolution time and heavy top-level imports, compared with the stored
+    baseline. Exits non-zero when a phase regressed past the tolerance.
+    """
+    from rcore import startup_profile
+
+    site = get_site(context)
+    report = startup_profile.profile_startup(site, runs=runs, heavy_import_ms=threshold)
+
+    frappe.init(site=site)
+    try:
+        baseline = startup_profile.load_baseline()
+        if save_baseline:
+            path = startup_profile.save_baseline(report)
+    finally:
+        frappe.destroy()
+
+    if as_json:
+        click.echo(frappe.as_json(report))
+    else:
+        click.secho(f"Startup phases (median of {report['runs']} runs)", bold=True)
+        for phase, ms in report["timings"].items():
+            click.echo(f"  {phase:<16}{ms:>10.1f} ms")
+
+        click.secho("\nHook resolution", bold=True)
+        for hook, ms in sorted(
+                report["hooks"].items(),
+                key=lambda item: -item[1] if isinstance(item[1], float) else 0):
+            value = f"{ms:>10.1f} ms" if isinstance(ms, float) else f"  failed: {ms}"
+            click.echo(f"  {value}  {hook}")
+
+        click.secho("\nrcore modules (cumulative import time)", bold=True)
+        for module, ms in report["modules"].items():
+            click.echo(f"  {ms:>10.1f} ms  {module}")
+
+        if report["heavy_imports"]:
+            click.secho(f"\nHeavy top-level imports (>= {threshold:g} ms)", bold=True, fg="yellow")
+            for item in report["heavy_imports"]:
+                click.echo(
+                    f"  {item['cumulative_ms']:>10.1f} ms  {item['module']} imports {item['imports']}")
+
+    regressed = False
+    if baseline:
+        click.secho("\nAgainst baseline", bold=True)
+        for phase, previous, current, slower in startup_profile.compare_to_baseline(
+                report, baseline, tolerance):
+            regressed = regressed or slower
+            click.secho(
+                f"  {phase:<16}{previous:>10.1f} -> {current:>8.1f} ms",
+                fg="red" if slower else None)
+
+    if save_baseline:
+        click.secho(f"\nBaseline saved to {path}", fg="green")
+    elif regressed:
+        click.secho(f"\nStartup regressed by more than {tolerance:.0%}", fg="red")
+        raise SystemExit(1)
+
+
+@click.command("rcore-run-parallel-tests")
+@click.option("--workers", default=os.cpu_count() or 2, type=int, help="Number of cloned sites / parallel workers")
+@click.option("--db-root-username", default=None, help="Postgres role allowed to create databases")
+@click.option("--db-root-password", default=None)
+@click.option("--coverage", is_flag=True, default=False, help="Collect and combine coverage")
+@click.option("--junit-xml-output", default=None, help="Write the merged JUnit report here")
+@click.option("--keep-sites", is_flag=True, default=False, help="Keep the cloned worker sites")
+@pass_context
+def run_parallel_tests(context, workers, db_root_username, db_root_password, coverage,
+                       junit_xml_output, keep_sites):
+    """
+    Run rcore's tests in parallel: the prepared test site is cloned once per
+    worker and test modules are sharded by historical duration.
+    """
+    from rcore.tests.parallel import run_parallel
+
+    site = get_site(context)
+    conf = frappe.get_site_config(sites_path=".", site_path=site)
+    root_login = db_root_username or conf.get("root_login") or "postgres"
+    root_password = db_root_password or conf.get("root_password")
+
+    summary = run_parallel(
+        site, workers, root_login, root_password, coverage=coverage,
+        junit_output=junit_xml_output, keep_sites=keep_sites)
+
+    for index, modules in enumerate(summary["shards"]):
+        click.echo(f"worker {index}: {len(modules)} modules")
+    for module in summary["failed_modules"]:
+        click.secho(f"\nFAILED {module}", fg="red", bold=True)
+        click.echo(summary["results"][module]["output"])
+
+    click.secho(
+        f"\n{summary['tests']} tests, {summary['failures']} failures, "
+        f"{summary['errors']} errors, {summary['skipped']} skipped",
+        fg="red" if summary["failed_modules"] else "green")
+    if summary.get("coverage") is not None:
+        click.echo(f"Coverage: {summary['coverage']}%")
+
+    if summary["failed_modules"]:
+        raise SystemExit(1)
+
+
+@click.command("rcore-benchmark")
+@click.option("--iterations", default=200, type=int)
+@click.option("--only", default=None, help="Run only benchmarks whose name contains this")
+@click.option("--output", default=None, help="Results file (default: the site's private folder)")
+@click.option("--save-baseline", is_flag=True, default=False, help="Also store the results as the baseline")
+@pass_context
+def benchmark(context, iterations, only, output, save_baseline):
+    """
+    Benchmark rcore's hot endpoints on a seeded site, recording latency
+    percentiles and queries per call.
+    """
+    from rcore.tests import benchmarks
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+    try:
+        frappe.set_user("Administrator")
+        results = benchmarks.run_benchmarks(iterations=iterations, only=only)
+        frappe.db.rollback()
+
+        path = benchmarks.save(results, output or benchmarks.get_results_path())
+        if save_baseline:
+            baseline_path = benchmarks.save(results, benchmarks.get_baseline_path())
+    finally:
+        frappe.destroy()
+
+    click.echo(f"{'benchmark':<55}{'p50':>9}{'p90':>9}{'p99':>9}{'queries':>9}")
+    for name, stats in results["benchmarks"].items():
+        if "error" in stats:
+            click.secho(f"{name:<55}  skipped: {stats['error']}", fg="yellow")
+            continue
+        click.echo(
+            f"{name:<55}{stats['p50_ms']:>9.3f}{stats['p90_ms']:>9.3f}"
+            f"{stats['p99_ms']:>9.3f}{stats['queries_per_call']:>9g}")
+
+    click.secho(f"\nResults written to {path}", fg="green")
+    if save_baseline:
+        click.secho(f"Baseline saved to {baseline_path}", fg="green")
+
+
+@click.command("rcore-benchmark-compare")
+@click.option("--results", default=None, help="Results file (default: the latest rcore-benchmark run)")
+@click.option("--baseline", default=None, help="Baseline file (default: the site's saved baseline)")
+@click.option("--threshold", default=0.25, type=float, help="Allowed p50/p90 slowdown (0.25 = 25%)")
+@pass_context
+def benchmark_compare(context, results, baseline, threshold):
+    """
+    Compare benchmark results with the baseline; exits non-zero on any
+    latency regression past the threshold or any extra query per call.
+    """
+    from rcore.tests import benchmarks
+
+    frappe.init(site=get_site(context))
+    try:
+        current = benchmarks.load(results or benchmarks.get_results_path())
+        previous = benchmarks.load(baseline or benchmarks.get_baseline_path())
+    finally:
+        frappe.destroy()
+
+    regressions = benchmarks.compare(current, previous, threshold)
+    if not regressions:
+        click.secho("No regressions against the baseline.", fg="green")
+        return
+
+    for name, metric, before, after in regressions:
+        click.secho(f"{name}: {metric} {before:g} -> {after:g}", fg="red")
+    raise SystemExit(1)
+
+
+@click.command("rcore-load-test")
+@click.option("--url", default=None, help="Base URL (default: the site's own URL)")
+@click.option("--users", default=10, type=int, help="Concurrent virtual users")
+@click.option("--duration", default=60, type=float, help="Seconds to run after ramp-up")
+@click.option("--ramp-up", default=10, type=float, help="Seconds over which users start")
+@click.option("--think-time", default=1.0, type=float, help="Mean pause between steps (seconds)")
+@click.option("--scenario", default=None, type=click.Path(exists=True), help="JSON scenario file")
+@click.option("--var", "variables", multiple=True, help="Scenario variable as name=value (repeatable)")
+@click.option("--token", default=None, help="API key:secret sent as the Authorization token")
+@click.option("--output", default=None, help="Write the full report as JSON here")
+@pass_context
+def load_test(context, url, users, duration, ramp_up, think_time, scenario, variables, token,
+              output):
+    """
+    Replay mobile launch sequences against a running bench and report
+    throughput, latency percentiles and error rates.
+    """
+    from rcore.tests.load import LoadTest, load_scenario
+
+    if not url:
+        frappe.init(site=get_site(context))
+        try:
+            url = frappe.utils.get_url()
+        finally:
+            frappe.destroy()
+
+    test = LoadTest(
+        url,
+        scenario=load_scenario(scenario) if scenario else None,
+        users=users,
+        duration=duration,
+        ramp_up=ramp_up,
+        think_time=think_time,
+        variables=dict(item.split("=", 1) for item in variables),
+        headers={"Authorization": f"token {token}"} if token else None,
+    )
+    report = test.run()
+
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=1)
+
+    click.echo(
+        f"{report['users']} users, {report['duration_s']}s, {report['iterations']} launch sequences")
+    if report["skipped_steps"]:
+        click.secho(f"Skipped (missing variables): {', '.join(report['skipped_steps'])}", fg="yellow")
+    click.echo(f"\n{'step':<30}{'reqs':>8}{'rps':>9}{'err %':>8}{'p50':>9}{'p90':>9}{'p99':>9}")
+    for name, stats in [*report["steps"].items(), ("overall", report["overall"])]:
+        if not stats["requests"]:
+            click.echo(f"{name:<30}{0:>8}")
+            continue
+        click.echo(
+            f"{name:<30}{stats['requests']:>8}{stats['throughput_rps']:>9.1f}"
+            f"{stats['error_rate'] * 100:>8.2f}{stats['p50_ms']:>9.1f}"
+            f"{stats['p90_ms']:>9.1f}{stats['p99_ms']:>9.1f}")
+
+
+@click.command("rcore-fleet-reconcile")
+@click.option("--sites", default=None, help="Comma-separated sites (default: every site on the bench)")
+@click.option("--sites-file", default=None, type=click.Path(exists=True), help="File with one site per line")
+@click.option("--workers", default=8, type=int, help="Sites processed at once")
+@click.option("--per-db-server", default=2, type=int, help="Sites processed at once per database server")
+@click.option("--install-missing", is_flag=True, default=False, help="Install rcore where it is missing")
+@click.option("--state-file", default=None, help="Checkpoint file (default: sites/rcore_fleet_state.json)")
+@click.option("--restart", is_flag=True, default=False, help="Ignore the checkpoint and redo every site")
+@click.option("--timeout", default=1800, type=int, help="Per-site timeout in seconds")
+def fleet_reconcile(sites, sites_file, workers, per_db_server, install_missing, state_file,
+                    restart, timeout):
+    """
+    Apply rcore's install/reconcile steps (extensions, fields, indexes)
+    across many sites in parallel, resuming from the last checkpoint.
+    """
+    from rcore.fleet import Fleet, get_fleet_sites
+
+    def report(site, result):
+        colour = {"done": "green", "failed": "red"}.get(result["status"])
+        click.secho(f"{result['status']:<14}{result['seconds']:>8.1f}s  {site}", fg=colour)
+
+    fleet = Fleet(
+        get_fleet_sites(sites, sites_file),
+        workers=workers,
+        per_db_server=per_db_server,
+        install_missing=install_missing,
+        state_file=state_file,
+        restart=restart,
+        timeout=timeout,
+        on_site_done=report,
+    )
+    skipped = len(fleet.sites) - len(fleet.pending_sites())
+    if skipped:
+        click.echo(f"Resuming: {skipped} sites already done (use --restart to redo them)")
+
+    start = time.monotonic()
+    state = fleet.run()
+
+    click.secho(f"\n{'site':<40}{'status':<14}{'seconds':>9}  failed steps", bold=True)
+    counts = {}
+    for site, result in state.items():
+        result = result or {"status": "pending"}
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+        detail = ", ".join(result.get("failed_steps") or []) or result.get("error", "")
+        click.echo(
+            f"{site:<40}{result['status']:<14}{result.get('seconds', 0):>9.1f}  {detail[:80]}")
+
+    summary = ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+    click.echo(f"\n{summary} in {time.monotonic() - start:.1f}s")
+    if counts.get("failed"):
+        raise SystemExit(1)
+
+
+commands = [
+    export_well_known,
+    profile_startup,
+    run_parallel_tests,
+    benchmark,
+    benchmark_compare,
+    load_test,
+    fleet_reconcile,
+]
@@ -0,0 +1,157 @@
+# Copyright (c) 2026 RokctAI
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Copyright (c) 2026, Rokct Intelligence (pty) Ltd.
+# For license information, please see license.txt
+
+
+"""
+Buffered counters in per-site Redis hashes.
+
+Request metrics and alias stats are bumped on every call, so workers add
+them up in memory and a background thread merges each site's pending
+values into Redis every FLUSH_INTERVAL seconds (and at exit) with one
+pipelined round trip. Counters are raw Redis numbers rather than pickled
+values; read them back with `read`.
+"""
+
+import atexit
+import contextvars
+import threading
+import time
+
+import frappe
+
+FLUSH_INTERVAL = 10
+
+# site -> {(hash key, field): amount}; increments are summed, set values
+# (e.g. timestamps) are last-write-wins
+_increments = {}
+_values = {}
+_sites_paths = {}
+_lock = threading.Lock()
+_flusher = [None]
+
+
+def increment(key, amounts):
+    """Add {field: amount} to the hash `key` for the current site."""
+    site = getattr(frappe.local, "site", None)
+    with _lock:
+        pending = _increments.setdefault(site, {})
+        for field, amount in amounts.items():
+            pending[(key, field)] = pending.get((key, field), 0) + amount
+        _sites_paths.setdefault(site, getattr(frappe.local, "sites_path", "."))
+    _ensure_flusher()
+
+
+def set_values(key, values):
+    """Set {field: value} in the hash `key` for the current site."""
+    site = getattr(frappe.local, "site", None)
+    with _lock:
+        pending = _values.setdefault(site, {})
+        for field, value in values.items():
+            pending[(key, field)] = value
+        _sites_paths.setdefault(site, getattr(frappe.local, "sites_path", "."))
+    _ensure_flusher()
+
+
+def flush():
+    """Merge this worker's pending counters for the current site into Redis."""
+    site = getattr(frappe.local, "site", None)
+    with _lock:
+        increments = _increments.pop(site, None)
+        values = _values.pop(site, None)
+
+    if not increments and not values:
+        return
+
+    try:
+        cache = frappe.cache()
+        pipe = cache.pipeline()
+        for (key, field), amount in (increments or {}).items():
+            if isinstance(amount, float):
+                pipe.hincrbyfloat(cache.make_key(key), field, amount)
+            else:
+                pipe.hincrby(cache.make_key(key), field, amount)
+        for (key, field), value in (values or {}).items():
+            pipe.hset(cache.make_key(key), field, value)
+        pipe.execute()
+    except Exception:
+        # Counters are best effort; never fail the caller over them
+        pass
+
+
+def read(key):
+    """{field: value} of the hash `key` for the current site, decoded."""
+    cache = frappe.cache()
+    pipe = cache.pipeline()
+    pipe.hgetall(cache.make_key(key))
+    raw = pipe.execute()[0] or {}
+    return {
+        frappe.safe_decode(field): frappe.safe_decode(value)
+        for field, value in raw.items()
+    }
+
+
+def flush_all():
+    """Flush every site's pending counters (background thread and exit)."""
+    with _lock:
+        sites = {
+            site: _sites_paths.get(site, ".")
+            for site in (*_increments, *_values)
+        }
+
+    for site, sites_path in sites.items():
+        if not site:
+            continue
+        try:
+            frappe.init(site=site, sites_path=sites_path)
+            flush()
+        except Exception:
+            pass
+        finally:
+            frappe.destroy()
+
+
+def _ensure_flusher():
+    if _flusher[0] is not None:
+        return
+    with _lock:
+        if _flusher[0] is not None:
+            return
+        thread = threading.Thread(target=_flush_loop, name="rcore-counters", daemon=True)
+        _flusher[0] = thread
+        thread.start()
+        atexit.register(_flush_at_exit)
+
+
+def _flush_loop():
+    while True:
+        time.sleep(FLUSH_INTERVAL)
+        _run_in_clean_context(flush_all)
+
+
+def _flush_at_exit():
+    _run_in_clean_context(flush_all)
+
+
+def _run_in_clean_context(fn):
+    # frappe.init/destroy must not clobber a request's locals on this thread
+    contextvars.Context().run(fn)
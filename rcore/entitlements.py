@@ -0,0 +1,168 @@
+# Copyright (c) 2026 RokctAI
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Copyright (c) 2026, Rokct Intelligence (pty) Ltd.
+# For license information, please see license.txt
+
+import frappe
+from frappe.query_builder import Order
+
+from rcore.caching import LocalLRU, clear_doctype_caches
+
+# Enabled modules per company, one hash field per company. Invalidated by
+# the Subscription Plan / Company Subscription doc_events in hooks.py.
+ENTITLEMENT_CACHE_KEY = "rcore_module_entitlements"
+
+_local_entitlements = LocalLRU(maxsize=1024, ttl=30)
+
+
+def has_module(company, module):
+    """
+    Check whether `company`'s subscription plan includes `module`.
+
+    Answered from the precomputed entitlement index; no document loads.
+    """
+    return module in get_company_modules(company)
+
+
+def get_company_modules(company):
+    """Return the frozenset of module names enabled for `company`."""
+    if not company:
+        return frozenset()
+
+    modules = _local_entitlements.get(company)
+    if modules is None:
+        cached = frappe.cache().hget(ENTITLEMENT_CACHE_KEY, company)
+        if cached is None:
+            index = build_entitlement_index([company])
+            cached = sorted(index.get(company, ()))
+            frappe.cache().hset(ENTITLEMENT_CACHE_KEY, company, cached)
+        modules = frozenset(cached)
+        _local_entitlements.set(company, modules)
+
+    return modules
+
+
+def build_entitlement_index(companies=None):
+    """
+    Build {company: frozenset(module_name)} with a single joined query over
+    Company Subscription and the Subscription Plan modules child table.
+
+    Pass `companies` to limit the index to those companies; by default every
+    company with a subscription is included. When a company has several
+    subscriptions, the most recently created one wins.
+    """
+    if companies is not None:
+        companies = [c for c in companies if c]
+        if not companies:
+            return {}
+
+    subscription = frappe.qb.DocType("Company Subscription")
+    plan_module = frappe.qb.DocType(_plan_module_doctype())
+
+    query = (
+        frappe.qb.from_(subscription)
+        .left_join(plan_module)
+        .on(
+            (plan_module.parent == subscription.subscription_plan)
+            & (plan_module.parenttype == "Subscription Plan")
+            & (plan_module.parentfield == "modules")
+        )
+        .select(
+            subscription.company,
+            subscription.subscription_plan,
+            plan_module.module_name,
+        )
+        .orderby(subscription.creation, order=Order.desc)
+    )
+    if companies is not None:
+        query = query.where(subscription.company.isin(companies))
+
+    plans = {}
+    index = {}
+    for row in query.run(as_dict=True):
+        plan = plans.setdefault(row.company, row.subscription_plan)
+        if row.subscription_plan != plan:
+            continue
+        modules = index.setdefault(row.company, set())
+        if row.module_name:
+            modules.add(row.module_name)
+
+    return {company: frozenset(modules) for company, modules in index.items()}
+
+
+def clear_entitlement_index(doc=None, method=None):
+    """
+    doc_events handler for Subscription Plan and Company Subscription.
+
+    A subscription change only drops the affected companies; a plan change
+    can touch any company on that plan, so the whole index is dropped.
+    Entries are dropped once the transaction commits (a reader before then
+    would re-cache the old plan, and a rollback must not drop anything) and
+    rebuilt lazily on the next lookup.
+    """
+    pending = getattr(frappe.local, "rcore_pending_entitlements", None)
+    if pending is None:
+        pending = frappe.local.rcore_pending_entitlements = {}
+        frappe.db.after_commit.add(_flush_pending_entitlements)
+        frappe.db.after_rollback.add(_discard_pending_entitlements)
+
+    doctype = doc.doctype if doc is not None else "Subscription Plan"
+    companies = pending.setdefault(doctype, set())
+    if doctype == "Company Subscription":
+        companies.add(doc.get("company"))
+        previous = doc.get_doc_before_save()
+        if previous:
+            companies.add(previous.get("company"))
+
+
+def _flush_pending_entitlements():
+    pending = _discard_pending_entitlements() or {}
+    if "Subscription Plan" in pending:
+        clear_entitlements()
+    else:
+        clear_entitlements(pending.get("Company Subscription", ()))
+
+    # Branding and other cached results built on the entitlements must be
+    # rebuilt from the new index, so clear them after it
+    for doctype in pending:
+        clear_doctype_caches(doctype)
+
+
+def _discard_pending_entitlements():
+    pending = getattr(frappe.local, "rcore_pending_entitlements", None)
+    frappe.local.rcore_pending_entitlements = None
+    return pending
+
+
+def clear_entitlements(companies=None):
+    """Drop the index entries for `companies` now (all by default)."""
+    if companies is None:
+        frappe.cache().delete_key(ENTITLEMENT_CACHE_KEY)
+        _local_entitlements.clear()
+        return
+
+    for company in filter(None, companies):
+        frappe.cache().hdel(ENTITLEMENT_CACHE_KEY, company)
+        _local_entitlements.delete(company)
+
+
+def _plan_module_doctype():
+    return frappe.get_meta("Subscription Plan").get_field("modules").options
@@ -0,0 +1,186 @@
+# Copyright (c) 2026 RokctAI
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Copyright (c) 2026, Rokct Intelligence (pty) Ltd.
+# For license information, please see license.txt
+
+"""
+Fleet-wide rollout of rcore's install/reconcile steps.
+
+Runs `rcore.install.reconcile_site` (and optionally `install-app rcore`)
+for many sites of a bench, each in its own `bench --site` process, on a
+bounded worker pool. Sites are queued per database server and only
+handed to the pool while their server is under its concurrency cap, so a
+busy server never ties up workers that other servers could use. Per-site outcomes are checkpointed to a state file after
+every site, so an interrupted rollout resumes where it stopped.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import frappe
+
+STATE_FILE = "rcore_fleet_state.json"
+
+DEFAULT_WORKERS = 8
+DEFAULT_PER_DB_SERVER = 2
+DEFAULT_SITE_TIMEOUT = 1800
+
+
+class Fleet:
+    def __init__(self, sites, workers=DEFAULT_WORKERS, per_db_server=DEFAULT_PER_DB_SERVER,
+                 install_missing=False, state_file=None, restart=False,
+                 timeout=DEFAULT_SITE_TIMEOUT, on_site_done=None):
+        self.sites = list(dict.fromkeys(sites))
+        self.workers = max(1, workers)
+        self.per_db_server = max(1, per_db_server)
+        self.install_missing = install_missing
+        self.state_file = os.path.abspath(state_file or STATE_FILE)
+        self.timeout = timeout
+        self.on_site_done = on_site_done
+        self.state = {} if restart else self._load_state()
+        self._state_lock = threading.Lock()
+
+    def pending_sites(self):
+        # Sites without rcore are only finished when we won't install it
+        finished = {"done"} if self.install_missing else {"done", "not_installed"}
+        return [
+            site for site in self.sites
+            if self.state.get(site, {}).get("status") not in finished
+        ]
+
+    def run(self):
+        """Roll out to every pending site; returns the per-site state."""
+        queues = {}
+        for site in self.pending_sites():
+            try:
+                server = _db_server(site)
+            except Exception as e:
+                self._finish(site, {"status": "failed", "error": f"{type(e).__name__}: {e}"}, 0)
+                continue
+            queues.setdefault(server, deque()).append(site)
+
+        running = {}
+        active = Counter()
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while queues or running:
+                # Round-robin across servers, one site at a time, while both
+                # the pool and the site's server have room
+                added = True
+                while added and len(running) < self.workers:
+                    added = False
+                    for server in list(queues):
+                        if len(running) >= self.workers:
+                            break
+                        if active[server] >= self.per_db_server:
+                            continue
+                        site = queues[server].popleft()
+                        if not queues[server]:
+                            del queues[server]
+                        active[server] += 1
+                        running[pool.submit(self._run_site, site)] = server
+                        added = True
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    active[running.pop(future)] -= 1
+
+        return {site: self.state.get(site) for site in self.sites}
+
+    def _run_site(self, site):
+        start = time.monotonic()
+        try:
+            result = self._reconcile(site)
+            if result.get("status") == "not_installed" and self.install_missing:
+                self._bench(site, "install-app", "rcore")
+                result = {"status": "done", "installed": True}
+        except subprocess.TimeoutExpired:
+            result = {"status": "failed", "error": f"timed out after {self.timeout}s"}
+        except subprocess.CalledProcessError as e:
+            result = {"status": "failed", "error": (e.stderr or e.stdout or "")[-2000:]}
+        except Exception as e:
+            # One site's failure must never abort the rollout
+            result = {"status": "failed", "error": f"{type(e).__name__}: {e}"}
+
+        self._finish(site, result, time.monotonic() - start)
+
+    def _finish(self, site, result, seconds):
+        result["seconds"] = round(seconds, 2)
+        result["finished_at"] = int(time.time())
+        self._checkpoint(site, result)
+        if self.on_site_done:
+            self.on_site_done(site, result)
+
+    def _reconcile(self, site):
+        output = self._bench(site, "execute", "rcore.install.reconcile_site")
+        for line in reversed(output.strip().splitlines()):
+            if line.startswith("{"):
+                return json.loads(line)
+        raise ValueError("reconcile_site returned no result")
+
+    def _bench(self, site, *args):
+        process = subprocess.run(
+            [sys.executable, "-m", "frappe.utils.bench_helper", "frappe", "--site", site, *args],
+            capture_output=True, text=True, check=True, timeout=self.timeout)
+        return process.stdout
+
+    def _checkpoint(self, site, result):
+        with self._state_lock:
+            self.state[site] = result
+            tmp_path = f"{self.state_file}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self.state, f, indent=1)
+            os.replace(tmp_path, self.state_file)
+
+    def _load_state(self):
+        try:
+            with open(self.state_file) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+
+def get_fleet_sites(sites=None, sites_file=None):
+    """
+    Sites named explicitly or in a file (one per line), else all sites
+    except parallel-test clones.
+    """
+    if sites:
+        return [site.strip() for site in sites.split(",") if site.strip()]
+    if sites_file:
+        with open(sites_file) as f:
+            return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    from rcore.tests.parallel import CLONE_FLAG
+
+    return [
+        site for site in frappe.utils.get_sites()
+        if not frappe.get_site_config(sites_path=".", site_path=site).get(CLONE_FLAG)
+    ]
+
+
+def _db_server(site):
+    conf = frappe.get_site_config(sites_path=".", site_path=site)
+    return (conf.get("db_host") or "localhost", str(conf.get("db_port") or ""))
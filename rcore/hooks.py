@@ -21,6 +21,8 @@
 # Copyright (c) 2026, Rokct Intelligence (pty) Ltd.
 # For license information, please see license.txt
 
+from rcore import aliases as _aliases
+
 app_name = "rcore"
 app_title = "Rcore"
 app_publisher = "ROKCT INTELLIGENCE (PTY) LTD"
@@ -40,10 +42,34 @@ before_tests = "rcore.tests.utils.before_tests"
 # ------------
 before_install = "rcore.install.check_site_role"
 after_install = "rcore.install.after_install"
+after_migrate = "rcore.install.setup_app_links_field"
 # before_uninstall for the build-in-progress guard is composed from the
 # builder SDK module's manifest (corporate/builder/frappe) - not declared
 # statically here, so it is registered exactly once.
 
+# Request Tracing / Metrics / Profiling
+# -------------------------------------
+# Adopt or generate the x-trace-id for every request; spans are recorded
+# and exported when rcore_tracing is set in site_config. Metrics and the
+# sampling profiler read the current trace, so they run before it ends.
+before_request = [
+    "rcore.tracing.before_request",
+    "rcore.metrics.before_request",
+    "rcore.profiling.before_request",
+]
+after_request = [
+    "rcore.profiling.after_request",
+    "rcore.metrics.after_request",
+    "rcore.tracing.after_request",
+]
+
+# Boot / Website Context
+# ----------------------
+# Resolved PaaS branding is rendered on first paint instead of being
+# patched in client-side after load.
+boot_session = "rcore.branding.boot_session"
+update_website_context = "rcore.branding.update_website_context"
+
 # Website Route Rules
 website_route_rules = [
     {
@@ -57,20 +83,52 @@ website_route_rules = [
 ]
 
 # Whitelisted Methods (Public APIs)
-whitelisted_methods = {
-    # The single universal entry point for the platform (routes by site role)
-    "rokct.platform.api": "rcore.platform.api.execute",
-    # Legacy paas.* aliases kept for clients still calling the old app name.
-    # Targets are the rcore-substituted paths the SDK module manifests declare.
-    "paas.api.auth.refresh": "rcore.auth.tenant.api.auth.auth.refresh",
-    "paas.tenant.api.log_frontend_error": "rcore.telemetry.tenant.telemetry.log_frontend_error.log_frontend_error",
-    "paas.api.upload.upload_file": "rcore.base.api.upload.upload_file",
-}
+# The alias table lives in rcore.aliases (single source of truth): the
+# universal "rokct.platform.api" entry point plus the legacy paas.* aliases
+# kept for clients still calling the old app name.
+whitelisted_methods = dict(_aliases.ALIASES)
 
-# Frappe's dispatcher resolves aliases from this hook (see frappe.override_whitelisted_method)
-override_whitelisted_methods = {
-    "rokct.platform.api": "rcore.platform.api.execute",
-    "paas.api.auth.refresh": "rcore.auth.tenant.api.auth.auth.refresh",
-    "paas.tenant.api.log_frontend_error": "rcore.telemetry.tenant.telemetry.log_frontend_error.log_frontend_error",
-    "paas.api.upload.upload_file": "rcore.base.api.upload.upload_file",
+# Frappe's dispatcher resolves aliases from this hook (see frappe.override_whitelisted_method).
+# Each alias points at a proxy that resolves its target once per worker and
+# records per-alias call counts and latency (rcore.aliases.get_alias_stats).
+override_whitelisted_methods = _aliases.get_override_whitelisted_methods()
+
+# Document Events
+# ---------------
+doc_events = {
+    # Entitlements are indexed per company; rcore.caching.cached functions
+    # (branding, .well-known documents) declare the doctypes they depend on
+    "Settings": {
+        "on_update": [
+            "rcore.caching.invalidate_doc_caches",
+            "rcore.branding_assets.enqueue_branding_assets",
+        ],
+    },
+    "Subscription Plan": {
+        "on_update": [
+            "rcore.entitlements.clear_entitlement_index",
+            "rcore.caching.invalidate_doc_caches",
+        ],
+        "on_trash": [
+            "rcore.entitlements.clear_entitlement_index",
+            "rcore.caching.invalidate_doc_caches",
+        ],
+    },
+    "Company Subscription": {
+        "on_update": [
+            "rcore.entitlements.clear_entitlement_index",
+            "rcore.caching.invalidate_doc_caches",
+        ],
+        "on_trash": [
+            "rcore.entitlements.clear_entitlement_index",
+            "rcore.caching.invalidate_doc_caches",
+        ],
+    },
+    # Precompiled .well-known documents
+    "Flutter App Configuration": {
+        "on_update": [
+            "rcore.caching.invalidate_doc_caches",
+            "rcore.api.app_links.rebuild_well_known",
+        ],
+    },
 }
@@ -19,9 +19,46 @@
 # SOFTWARE.
 
 import frappe
+import json
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from frappe.utils import get_bench_path
 
+from rcore.catalog import catalog_snapshot, get_catalog
+
+# Parallel connections used for index builds during install
+# (site_config: rcore_install_workers)
+DEFAULT_INSTALL_WORKERS = 4
+
+INSTALL_REPORT_FILE = "rcore_install_report.json"
+
+# JSON columns indexed with GIN. Only json/jsonb columns are indexed: a
+# jsonb cast over a text column would fail on (and reject) non-JSON values.
+GIN_INDEXES = [
+    ("tabRemote Config", "poi_data"),
+    ("tabRemote Config", "quick_sale_no_user_stock_ids"),
+    ("tabRemote Config", "mega_char_maintenance_durations"),
+    ("tabRemote Config", "softener_maintenance_durations"),
+    ("tabRemote Config", "maintenance_types"),
+    ("tabRemote Config", "filter_types"),
+    ("tabRequest Model", "data"),
+    ("tabPayment Payload", "payload"),
+    # WhatsApp GIN Indexes
+    ("tabWhatsApp Session", "cart_items"),
+]
+
+# Text columns indexed for full-text search
+FTS_INDEXES = [
+    ("tabShop", "shop_name"),
+    ("tabCategory", "keywords"),
+    ("tabUser", "first_name"),
+    ("tabUser", "last_name"),
+    ("tabUser", "email"),
+    ("tabUser", "phone"),
+]
+
 
 def check_site_role():
     """
@@ -37,13 +74,248 @@ def check_site_role():
 def after_install():
     """
     Wrapper to run all post-installation tasks.
+
+    Runs the install step graph (see get_install_steps): extensions and
+    columns first, then bulk seeding, then the index builds in parallel on
+    their own connections, so seeded rows don't pay index maintenance.
+    A per-step timing report is printed and written to the site's logs.
+    """
+    with catalog_snapshot():
+        report = run_install_steps(get_install_steps())
+    print_install_report(report)
+    write_install_report(report)
+
+
+def reconcile_site():
+    """
+    Re-apply the idempotent install steps (extensions, columns, fields and
+    indexes; no seeding) to an existing site. Entry point for fleet
+    rollouts via `bench --site <site> execute`.
+    """
+    if "rcore" not in frappe.get_installed_apps():
+        return {"status": "not_installed"}
+
+    skip = {"seeders", "fetch_sources"}
+    steps = [step for step in get_install_steps() if step["name"] not in skip]
+    with catalog_snapshot():
+        report = run_install_steps(steps)
+    write_install_report(report)
+
+    failed = [entry["name"] for entry in report["steps"] if entry["status"] == "failed"]
+    return {
+        "status": "failed" if failed else "done",
+        "failed_steps": failed,
+        "install_seconds": report["total_seconds"],
+    }
+
+
+def get_install_steps():
+    """
+    The after_install step graph. Each step has a `name` and `method`;
+    `after` lists steps it must follow, `requires` steps that must also have
+    succeeded (returned anything but False), and `isolated` steps run in
+    parallel on their own DB connection.
     """
-    setup_gin_indexes()
-    setup_vector_extension()
-    setup_geospatial_extensions()
-    setup_product_vector_column()
-    run_seeders()
-    check_and_fetch_sources()
+    setup = ["vector_extension", "geospatial_extensions", "product_vector_column", "app_links_field"]
+    steps = [
+        {"name": "vector_extension", "method": setup_vector_extension},
+        {"name": "geospatial_extensions", "method": setup_geospatial_extensions},
+        {"name": "app_links_field", "method": setup_app_links_field},
+        {
+            "name": "product_vector_column",
+            "method": add_product_vector_column,
+            "requires": ["vector_extension"],
+        },
+        {"name": "seeders", "method": run_seeders, "after": setup},
+        {
+            "name": "product_vector_index",
+            "method": create_product_vector_index,
+            "after": ["seeders"],
+            "requires": ["product_vector_column"],
+            "isolated": True,
+        },
+        {"name": "fetch_sources", "method": check_and_fetch_sources, "after": ["seeders"]},
+    ]
+
+    indexes = [("gin", table, column, create_gin_index) for table, column in GIN_INDEXES]
+    indexes.append(("gin", "tabWhatsApp Session", "metadata", create_whatsapp_metadata_index))
+    fts_indexes = list(FTS_INDEXES)
+    if "erpnext" in frappe.get_installed_apps():
+        # Item is an ERPNext doctype
+        fts_indexes.insert(0, ("tabItem", "item_name"))
+    indexes += [("fts", table, column, create_fts_index) for table, column in fts_indexes]
+
+    for kind, table, column, method in indexes:
+        steps.append({
+            "name": f"{kind}_index:{table}.{column}",
+            "method": partial(method, table, column),
+            "after": ["seeders"],
+            "isolated": True,
+        })
+
+    return steps
+
+
+def run_install_steps(steps):
+    """
+    Run `steps` wave by wave in dependency order. Within a wave, isolated
+    steps run on a thread pool (one connection each) while the rest run
+    in order on the current connection. Returns the timing report.
+    """
+    waves = _install_waves(steps)
+    workers = frappe.conf.get("rcore_install_workers") or DEFAULT_INSTALL_WORKERS
+    site = frappe.local.site
+    outcome = {}
+    report = {"site": site, "steps": []}
+    start = time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for wave_number, wave in enumerate(waves):
+            runnable, isolated = [], []
+            for step in wave:
+                if any(outcome.get(name) != "ok" for name in step.get("requires", ())):
+                    outcome[step["name"]] = "skipped"
+                    report["steps"].append(_step_entry(step, wave_number, "skipped", 0.0))
+                elif step.get("isolated"):
+                    isolated.append(step)
+                else:
+                    runnable.append(step)
+
+            if isolated:
+                # Isolated steps see only committed data and must not wait
+                # on locks held by this connection
+                frappe.db.commit()
+            catalog = getattr(frappe.local, "rcore_catalog", None)
+            futures = [
+                (step, pool.submit(_run_isolated_step, site, step, catalog))
+                for step in isolated
+            ]
+            for step in runnable:
+                status, seconds = _run_step(step)
+                outcome[step["name"]] = status
+                report["steps"].append(_step_entry(step, wave_number, status, seconds))
+            for step, future in futures:
+                status, seconds = future.result()
+                outcome[step["name"]] = status
+                report["steps"].append(_step_entry(step, wave_number, status, seconds))
+
+    frappe.db.commit()
+    report["total_seconds"] = round(time.monotonic() - start, 3)
+    return report
+
+
+def print_install_report(report):
+    print(f"--- rcore install steps ({report['total_seconds']:.1f}s total) ---")
+    for entry in report["steps"]:
+        where = "parallel" if entry["isolated"] else "main"
+        print(
+            f"  [{entry['wave']}] {entry['status']:<8}{entry['seconds']:>8.2f}s  "
+            f"{where:<9}{entry['name']}"
+        )
+
+
+def write_install_report(report):
+    try:
+        path = frappe.get_site_path("logs", INSTALL_REPORT_FILE)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(report, f, indent=1)
+    except OSError as e:
+        print(f"⚠️ Could not write install report: {e}")
+
+
+def _install_waves(steps):
+    """Group steps into waves; every step comes after its dependencies."""
+    by_name = {step["name"]: step for step in steps}
+    level = {}
+
+    def resolve(name, path=()):
+        if name in level:
+            return level[name]
+        if name in path:
+            raise frappe.ValidationError(f"Install step cycle: {' -> '.join(path + (name,))}")
+        step = by_name[name]
+        depends = set(step.get("after", ())) | set(step.get("requires", ()))
+        level[name] = 1 + max(
+            (resolve(dep, path + (name,)) for dep in depends if dep in by_name), default=-1)
+        return level[name]
+
+    waves = {}
+    for step in steps:
+        waves.setdefault(resolve(step["name"]), []).append(step)
+    return [waves[number] for number in sorted(waves)]
+
+
+def _run_step(step):
+    start = time.monotonic()
+    try:
+        result = step["method"]()
+        status = "failed" if result is False else "ok"
+    except Exception as e:
+        frappe.db.rollback()
+        print(f"⚠️ Install step {step['name']} failed: {e}")
+        status = "failed"
+
+    catalog = getattr(frappe.local, "rcore_catalog", None)
+    if status == "failed" and catalog is not None:
+        # A rollback may have undone DDL the snapshot already records
+        catalog.load()
+    return status, round(time.monotonic() - start, 3)
+
+
+def _run_isolated_step(site, step, catalog=None):
+    """Run a step on its own connection in a worker thread."""
+    frappe.init(site=site)
+    try:
+        frappe.connect()
+        frappe.set_user("Administrator")
+        frappe.flags.in_install = "rcore"
+        # Share the caller's catalog snapshot instead of reading our own
+        frappe.local.rcore_catalog = catalog
+        status, seconds = _run_step(step)
+        frappe.db.commit()
+        return status, seconds
+    finally:
+        frappe.destroy()
+
+
+def _step_entry(step, wave, status, seconds):
+    return {
+        "name": step["name"],
+        "wave": wave,
+        "status": status,
+        "seconds": seconds,
+        "isolated": bool(step.get("isolated")),
+    }
+
+
+def setup_app_links_field():
+    """
+    Adds the App Links registry (Flutter App Link child table) to Flutter
+    App Configuration. Also runs after migrate, since the parent doctype is
+    composed in from the SDK modules and may arrive after rcore's install.
+    """
+    if not frappe.db.exists("DocType", "Flutter App Configuration"):
+        return
+
+    from frappe.custom.doctype.custom_field.custom_field import create_custom_fields
+
+    create_custom_fields(
+        {
+            "Flutter App Configuration": [
+                {
+                    "fieldname": "app_links",
+                    "fieldtype": "Table",
+                    "label": "App Links",
+                    "options": "Flutter App Link",
+                    "insert_after": "sha256_fingerprint",
+                    "description": "Additional apps (e.g. customer, driver, seller) "
+                    "published in assetlinks.json and apple-app-site-association",
+                }
+            ]
+        },
+        update=True,
+    )
 
 
 def setup_geospatial_extensions():
@@ -52,8 +324,11 @@ def setup_geospatial_extensions():
     bypass_sql
     """
     try:
-        frappe.db.sql("CREATE EXTENSION IF NOT EXISTS cube")
-        frappe.db.sql("CREATE EXTENSION IF NOT EXISTS earthdistance")
+        catalog = get_catalog()
+        for extension in ("cube", "earthdistance"):
+            if not catalog.has_extension(extension):
+                frappe.db.sql(f"CREATE EXTENSION IF NOT EXISTS {extension}")
+                catalog.add_extension(extension)
         return True
     except Exception as e:
         frappe.db.rollback()
@@ -67,7 +342,10 @@ def setup_vector_extension():
     bypass_sql
     """
     try:
-        frappe.db.sql("CREATE EXTENSION IF NOT EXISTS vector")
+        catalog = get_catalog()
+        if not catalog.has_extension("vector"):
+            frappe.db.sql("CREATE EXTENSION IF NOT EXISTS vector")
+            catalog.add_extension("vector")
         return True
     except Exception as e:
         frappe.db.rollback()
@@ -80,27 +358,38 @@ def setup_product_vector_column():
     Adds a vector(384) column to the Product table for semantic search.
     bypass_sql
     """
-    # Item is an ERPNext doctype; rcore no longer hard-requires erpnext.
-    if "erpnext" not in frappe.get_installed_apps():
-        print("ℹ️ ERPNext not installed. Skipping Product vector column setup.")
-        return
-
     if not setup_vector_extension():
         print(
             "⚠️ Skipping Product vector column creation due to missing extension."
         )
         return
 
+    if add_product_vector_column():
+        create_product_vector_index()
+
+
+def add_product_vector_column():
+    """
+    Adds the vector(384) embedding column to Item (the extension must
+    already be enabled). Returns True if the column is in place.
+    bypass_sql
+    """
+    # Item is an ERPNext doctype; rcore no longer hard-requires erpnext.
+    if "erpnext" not in frappe.get_installed_apps():
+        print("ℹ️ ERPNext not installed. Skipping Product vector column setup.")
+        return False
+
     try:
+        catalog = get_catalog()
         # Check if table exists
-        if not frappe.db.table_exists("Item"):
+        if not catalog.table_exists("Item"):
             print(
                 "🛍️ Item table does not exist. Skipping vector column setup."
             )
-            return
+            return False
 
-        # Check if column exists using standard API
-        if not frappe.db.has_column("Item", "embedding"):
+        # Check if column exists
+        if not catalog.has_column("Item", "embedding"):
             print("🛍️ Adding 'embedding' vector column to Product (Item)...")
 
             # Note: DDL statements (ALTER TABLE, CREATE INDEX) require raw SQL.
@@ -109,62 +398,78 @@ def setup_product_vector_column():
             frappe.db.sql(
                 'ALTER TABLE "tabItem" ADD COLUMN embedding vector(384)'
             )
-
-            # Add an HNSW index for fast approximate nearest neighbor search
-            print("🛍️ Creating HNSW index for Product embeddings...")
-            frappe.db.sql("""
-                CREATE INDEX ON \"tabItem\" USING hnsw (embedding vector_l2_ops)
-            """)
+            catalog.add_column("Item", "embedding", "USER-DEFINED")
+        return True
 
     except Exception as e:
         frappe.db.rollback()
         frappe.log_error(f"Failed to setup Product vector column: {e}")
         print(f"⚠️ Failed to setup vector column: {e}")
+        return False
+
+
+def create_product_vector_index():
+    """
+    Adds an HNSW index on Item.embedding for fast approximate nearest
+    neighbor search. Built after seeding, so seeded rows are indexed in
+    one pass.
+    bypass_sql
+    """
+    index_name = "item_embedding_hnsw_idx"
+    try:
+        catalog = get_catalog()
+        # Earlier installs created this index without a fixed name
+        if not catalog.has_index_like("Item", "using hnsw (embedding"):
+            print("🛍️ Creating HNSW index for Product embeddings...")
+            definition = 'USING hnsw (embedding vector_l2_ops)'
+            frappe.db.sql(f'CREATE INDEX {index_name} ON "tabItem" {definition}')
+            catalog.add_index(index_name, "Item", definition)
+        return True
+    except Exception as e:
+        frappe.db.rollback()
+        frappe.log_error(f"Failed to create Product vector index: {e}")
+        print(f"⚠️ Failed to create vector index: {e}")
+        return False
 
 
 def setup_gin_indexes():
     """
     Creates GIN indexes for JSONB fields and FTS columns in PostgreSQL.
-    Intended for fresh installs.
+    Intended for fresh installs. Returns False if any index failed.
     """
-    # JSONB GIN Indexes
-    create_gin_index("tabRemote Config", "poi_data")
-    create_gin_index("tabRemote Config", "quick_sale_no_user_stock_ids")
-    create_gin_index("tabRemote Config", "mega_char_maintenance_durations")
-    create_gin_index("tabRemote Config", "softener_maintenance_durations")
-    create_gin_index("tabRemote Config", "maintenance_types")
-    create_gin_index("tabRemote Config", "filter_types")
+    results = []
+    with catalog_snapshot():
+        # JSONB GIN Indexes
+        for table, column in GIN_INDEXES:
+            results.append(create_gin_index(table, column))
+        results.append(create_whatsapp_metadata_index())
 
-    create_gin_index("tabRequest Model", "data")
-    create_gin_index("tabPayment Payload", "payload")
+        # FTS Indexes
+        if "erpnext" in frappe.get_installed_apps():
+            # Item is an ERPNext doctype
+            results.append(create_fts_index("tabItem", "item_name"))
+        for table, column in FTS_INDEXES:
+            results.append(create_fts_index(table, column))
 
-    # WhatsApp GIN Indexes
-    create_gin_index("tabWhatsApp Session", "cart_items")
+    return all(results)
+
+
+def create_whatsapp_metadata_index(table="tabWhatsApp Session", column="metadata"):
     # Check if metadata column exists before indexing (handle missing table
     # gracefully)
     try:
-        if frappe.db.has_column("tabWhatsApp Session", "metadata"):
-            create_gin_index("tabWhatsApp Session", "metadata")
+        if get_catalog().has_column(table, column):
+            return create_gin_index(table, column)
     except Exception:
         # Table might not exist yet or other DB error - ignore
         pass
-
-    # FTS Indexes
-    if "erpnext" in frappe.get_installed_apps():
-        # Item is an ERPNext doctype
-        create_fts_index("tabItem", "item_name")
-    create_fts_index("tabShop", "shop_name")
-    create_fts_index("tabCategory", "keywords")
-
-    create_fts_index("tabUser", "first_name")
-    create_fts_index("tabUser", "last_name")
-    create_fts_index("tabUser", "email")
-    create_fts_index("tabUser", "phone")
+    return True
 
 
 def create_gin_index(table, column):
     """
     Creates GIN indexes for JSONB fields and FTS columns.
+    Returns False if the index could not be created.
     bypass_sql
     """
     try:
@@ -173,53 +478,59 @@ def create_gin_index(table, column):
         clean_table = table.lower().replace("tab", "").replace(" ", "_")
         index_name = f"{clean_table}_{column}_gin_idx"
 
-        # Check if table exists using standard API to prevent "relation does
-        # not exist" errors
-        if not frappe.db.table_exists(table):
+        # Check if table exists to prevent "relation does not exist" errors
+        catalog = get_catalog()
+        if not catalog.table_exists(table):
             print(
                 f"ℹ️ Table {table} does not exist yet. Skipping index {index_name}.")
-            return
+            return True
 
-        chk = frappe.db.sql(
-            f"SELECT 1 FROM pg_indexes WHERE indexname = '{index_name}'",
-            pluck=True,
-        )
-        if not chk:
-            # Try catch GIN index creation
-            # If column is json (text), cast to jsonb for indexing support
+        data_type = catalog.column_type(table, column)
+        if data_type not in ("json", "jsonb"):
+            print(
+                f"ℹ️ {table}.{column} is not a JSON column ({data_type}). "
+                f"Skipping index {index_name}.")
+            return True
+
+        if not catalog.has_index(index_name):
+            # json columns are cast to jsonb for indexing support
             frappe.db.sql(
                 f'CREATE INDEX {index_name} ON "{table}" USING GIN (({column}::jsonb))')
+            catalog.add_index(index_name, table)
+        return True
     except Exception as e:
         frappe.db.rollback()
         # Log purely as warning, don't crash install
         print(f"⚠️ Failed to create GIN index {index_name}: {str(e)}")
+        return False
 
 
 def create_fts_index(table, column):
     """
     Creates FTS indexes on PostgreSQL.
+    Returns False if the index could not be created.
     bypass_sql
     """
     try:
         clean_table = table.lower().replace("tab", "").replace(" ", "_")
         index_name = f"{clean_table}_{column}_fts_idx"
 
-        # Check if table exists using standard API
-        if not frappe.db.table_exists(table):
+        # Check if table exists
+        catalog = get_catalog()
+        if not catalog.table_exists(table):
             print(
                 f"ℹ️ Table {table} does not exist yet. Skipping FTS index {index_name}.")
-            return
+            return True
 
-        chk = frappe.db.sql(
-            f"SELECT 1 FROM pg_indexes WHERE indexname = '{index_name}'",
-            pluck=True,
-        )
-        if not chk:
+        if not catalog.has_index(index_name):
             frappe.db.sql(
                 f"CREATE INDEX {index_name} ON \"{table}\" USING GIN (to_tsvector('english', {column}))")
+            catalog.add_index(index_name, table)
+        return True
     except Exception as e:
         frappe.db.rollback()
         print(f"⚠️ Failed to create FTS index {index_name}: {str(e)}")
+        return False
 
 
 def run_seeders():
@@ -288,6 +599,7 @@ def run_seeders():
         frappe.log_error(
             f"Error running rcore seeders: {e}", "rcore Seeder Error"
         )
+        return False
 
 
 def check_and_fetch_sources():
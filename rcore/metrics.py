@@ -0,0 +1,214 @@
+# Copyright (c) 2026 RokctAI
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Copyright (c) 2026, Rokct Intelligence (pty) Ltd.
+# For license information, please see license.txt
+
+"""
+Per-endpoint request metrics in Prometheus text format.
+
+Each worker keeps latency histograms (log-scale, HDR-style buckets),
+request counts by status class and DB query totals for rcore-owned
+endpoints as buffered counters (rcore.counters) in a per-site Redis hash.
+Endpoints are labelled by alias or whitelisted rcore method; any other
+rcore path is counted as "other", so clients can't mint new labels. `prometheus` renders the merged view for scraping.
+"""
+
+import hmac
+import re
+import time
+
+import frappe
+from werkzeug.wrappers import Response
+
+from rcore import counters
+from rcore.aliases import ALIASES
+from rcore.tracing import get_query_count
+
+METRICS_CACHE_KEY = "rcore_metrics"
+
+# Upper bounds (seconds) doubling every two buckets: 0.5ms .. ~32s
+BUCKETS = tuple(round(0.0005 * 2 ** (i / 2), 6) for i in range(33))
+
+# Non-API routes served by rcore (hooks.website_route_rules)
+TRACKED_PATHS = (
+    "/.well-known/assetlinks.json",
+    "/.well-known/apple-app-site-association",
+)
+
+# Label for rcore paths that aren't a whitelisted method
+OTHER_ENDPOINT = "other"
+
+METHOD_PATTERN = re.compile(r"^rcore(\.[A-Za-z_][A-Za-z0-9_]*)+$")
+# Cap on remembered non-endpoint paths per worker
+MAX_REJECTED_METHODS = 1024
+
+_known_methods = set()
+_rejected_methods = set()
+
+
+def before_request():
+    """before_request hook: note when the request started."""
+    frappe.local.rcore_request_start = time.perf_counter()
+
+
+def after_request(response, request):
+    """after_request hook: record latency, status and query count."""
+    start = getattr(frappe.local, "rcore_request_start", None)
+    if start is None:
+        return
+    frappe.local.rcore_request_start = None
+
+    endpoint = get_endpoint(request.path)
+    if not endpoint:
+        return
+
+    status = getattr(response, "status_code", None) or 500
+    record(endpoint, time.perf_counter() - start, status, get_query_count())
+
+
+def get_endpoint(path):
+    """Metric label for `path`, or None if it isn't an rcore endpoint."""
+    if path.startswith("/api/method/"):
+        method = path[len("/api/method/"):]
+        if method in ALIASES:
+            return method
+        if method.startswith("rcore."):
+            return method if _is_rcore_method(method) else OTHER_ENDPOINT
+        return None
+    if path in TRACKED_PATHS:
+        return path
+    return None
+
+
+def _is_rcore_method(method):
+    """True if `method` names a whitelisted rcore function."""
+    if method in _known_methods:
+        return True
+    if method in _rejected_methods or not METHOD_PATTERN.match(method):
+        return False
+
+    try:
+        whitelisted = frappe.get_attr(method) in frappe.whitelisted
+    except Exception:
+        whitelisted = False
+
+    if whitelisted:
+        _known_methods.add(method)
+    else:
+        if len(_rejected_methods) >= MAX_REJECTED_METHODS:
+            _rejected_methods.clear()
+        _rejected_methods.add(method)
+    return whitelisted
+
+
+def record(endpoint, seconds, status, queries=0):
+    counters.increment(METRICS_CACHE_KEY, {
+        f"{endpoint}|bucket|{_bucket_index(seconds)}": 1,
+        f"{endpoint}|count": 1,
+        f"{endpoint}|status|{status // 100}xx": 1,
+        f"{endpoint}|queries": queries,
+        f"{endpoint}|seconds": float(seconds),
+    })
+
+
+@frappe.whitelist(allow_guest=True, methods=["GET"])
+def prometheus():
+    """
+    Prometheus scrape endpoint. Requires either a System Manager session or
+    `Authorization: Bearer <rcore_metrics_token>` from site_config.
+    """
+    _check_access()
+    counters.flush()
+
+    body = render(_read_metrics())
+    return Response(body, mimetype="text/plain", content_type="text/plain; version=0.0.4")
+
+
+def render(metrics):
+    """Render {endpoint: {field: value}} as Prometheus exposition text."""
+    lines = [
+        "# HELP rcore_request_duration_seconds Request latency of rcore endpoints.",
+        "# TYPE rcore_request_duration_seconds histogram",
+    ]
+    for endpoint, entry in sorted(metrics.items()):
+        label = _label(endpoint)
+        cumulative = 0
+        for index, bound in enumerate(BUCKETS):
+            cumulative += entry.get(f"bucket|{index}", 0)
+            lines.append(
+                f'rcore_request_duration_seconds_bucket{{endpoint="{label}",le="{bound}"}} {cumulative}')
+        lines.append(
+            f'rcore_request_duration_seconds_bucket{{endpoint="{label}",le="+Inf"}} {entry.get("count", 0)}')
+        lines.append(
+            f'rcore_request_duration_seconds_sum{{endpoint="{label}"}} {entry.get("seconds", 0.0)}')
+        lines.append(
+            f'rcore_request_duration_seconds_count{{endpoint="{label}"}} {entry.get("count", 0)}')
+
+    lines += [
+        "# HELP rcore_requests_total Requests to rcore endpoints by status class.",
+        "# TYPE rcore_requests_total counter",
+    ]
+    for endpoint, entry in sorted(metrics.items()):
+        for field, value in sorted(entry.items()):
+            if field.startswith("status|"):
+                lines.append(
+                    f'rcore_requests_total{{endpoint="{_label(endpoint)}",status="{field[7:]}"}} {value}')
+
+    lines += [
+        "# HELP rcore_db_queries_total SQL statements issued by rcore endpoints.",
+        "# TYPE rcore_db_queries_total counter",
+    ]
+    for endpoint, entry in sorted(metrics.items()):
+        lines.append(
+            f'rcore_db_queries_total{{endpoint="{_label(endpoint)}"}} {entry.get("queries", 0)}')
+
+    return "\n".join(lines) + "\n"
+
+
+def _read_metrics():
+    metrics = {}
+    for field, value in counters.read(METRICS_CACHE_KEY).items():
+        endpoint, _, name = field.partition("|")
+        metrics.setdefault(endpoint, {})[name] = (
+            float(value) if name == "seconds" else int(value))
+    return metrics
+
+
+def _check_access():
+    token = frappe.conf.get("rcore_metrics_token")
+    header = frappe.get_request_header("Authorization") or ""
+    if token and header.startswith("Bearer ") and hmac.compare_digest(
+            header[len("Bearer "):], token):
+        return
+    frappe.only_for("System Manager")
+
+
+def _bucket_index(seconds):
+    """Index of the first bucket holding `seconds`; len(BUCKETS) past the last."""
+    for index, bound in enumerate(BUCKETS):
+        if seconds <= bound:
+            return index
+    # Only counted towards le="+Inf" (the total count)
+    return len(BUCKETS)
+
+
+def _label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"')
@@ -0,0 +1,209 @@
+# Copyright (c) 2026 RokctAI
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Copyright (c) 2026, Rokct Intelligence (pty) Ltd.
+# For license information, please see license.txt
+
+"""
+Opt-in sampling profiler for rcore endpoints.
+
+With `rcore_profile_sample_rate` set to N in site_config, one in every N
+requests to a method matching `rcore_profile_methods` (default: rcore.*
+and the legacy aliases) is profiled. A request can also ask for a profile
+explicitly with `X-Rcore-Profile: <rcore_profile_token>`.
+
+A background thread samples the request thread's stack every
+`rcore_profile_interval_ms` and the result is written in collapsed-stack
+format (loadable by speedscope and flamegraph.pl) to
+`logs/rcore_profiles/<profile id>.collapsed`; the response carries an
+`X-Rcore-Profile` header naming the profile id. Profile ids are generated
+server side (the trace id, when it is plain hex, plus a random suffix), so
+clients can't choose or overwrite file names, and the folder is capped by
+count and total size.
+"""
+
+import collections
+import fnmatch
+import hmac
+import itertools
+import os
+import re
+import secrets
+import sys
+import threading
+import time
+
+import frappe
+
+from rcore.tracing import get_trace_id
+
+PROFILE_HEADER = "X-Rcore-Profile"
+PROFILE_DIR = "rcore_profiles"
+
+DEFAULT_METHODS = ("rcore.*", "paas.*", "rokct.*")
+DEFAULT_INTERVAL_MS = 5
+
+# Stop sampling runaway requests after this long
+MAX_PROFILE_SECONDS = 60
+MAX_STACK_DEPTH = 128
+# Oldest profiles are pruned beyond this many, or this many bytes, per site
+MAX_PROFILES = 200
+MAX_PROFILE_BYTES = 50 * 1024 * 1024
+
+TRACE_ID_PATTERN = re.compile(r"^[0-9a-f]{1,64}$")
+
+_request_counter = itertools.count(1)
+
+
+class Sampler(threading.Thread):
+    """Samples one thread's stack at a fixed interval."""
+
+    def __init__(self, thread_id, interval):
+        super().__init__(name="rcore-profiler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self.samples = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        deadline = time.monotonic() + MAX_PROFILE_SECONDS
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None or time.monotonic() > deadline:
+                return
+            self.stacks[_collapse(frame)] += 1
+            self.samples += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def collapsed(self):
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def before_request():
+    """before_request hook: start sampling if this request is selected."""
+    frappe.local.rcore_profiler = None
+    if not _should_profile():
+        return
+
+    interval = (frappe.conf.get("rcore_profile_interval_ms") or DEFAULT_INTERVAL_MS) / 1000
+    sampler = Sampler(threading.get_ident(), interval)
+    sampler.start()
+    frappe.local.rcore_profiler = sampler
+
+
+def after_request(response, request):
+    """after_request hook: stop sampling and save the profile."""
+    sampler = getattr(frappe.local, "rcore_profiler", None)
+    if sampler is None:
+        return
+    frappe.local.rcore_profiler = None
+    sampler.stop()
+
+    if not sampler.samples:
+        return
+
+    try:
+        profile_id = save_profile(sampler.collapsed(), get_trace_id())
+    except OSError:
+        frappe.log_error(title="rcore profiler: could not save profile")
+        return
+
+    if response is not None:
+        response.headers[PROFILE_HEADER] = profile_id
+
+
+def save_profile(collapsed, trace_id=None):
+    """
+    Write a collapsed-stack profile under a new server-generated id, which
+    starts with `trace_id` if that is plain hex; returns the id.
+    """
+    directory = os.path.abspath(frappe.get_site_path("logs", PROFILE_DIR))
+    os.makedirs(directory, exist_ok=True)
+
+    profile_id = secrets.token_hex(8)
+    if trace_id and TRACE_ID_PATTERN.match(trace_id):
+        profile_id = f"{trace_id}-{profile_id}"
+
+    path = os.path.join(directory, f"{profile_id}.collapsed")
+    with open(path, "x") as f:
+        f.write(collapsed)
+
+    _prune(directory)
+    return profile_id
+
+
+def _should_profile():
+    request = frappe.request
+    token = frappe.conf.get("rcore_profile_token")
+    header = request.headers.get(PROFILE_HEADER)
+    if token and header and hmac.compare_digest(header, token):
+        return True
+
+    rate = frappe.conf.get("rcore_profile_sample_rate")
+    if not rate or not request.path.startswith("/api/method/"):
+        return False
+
+    method = request.path[len("/api/method/"):]
+    patterns = frappe.conf.get("rcore_profile_methods") or DEFAULT_METHODS
+    if not any(fnmatch.fnmatchcase(method, pattern) for pattern in patterns):
+        return False
+
+    return next(_request_counter) % int(rate) == 0
+
+
+def _collapse(frame):
+    names = []
+    while frame is not None and len(names) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        module = frame.f_globals.get("__name__", code.co_filename)
+        names.append(f"{module}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def _prune(directory):
+    """Delete the oldest profiles until both caps are met."""
+    entries = []
+    for entry in os.scandir(directory):
+        if not entry.name.endswith(".collapsed"):
+            continue
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    entries.sort()
+    count = len(entries)
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in entries:
+        if count <= MAX_PROFILES and total <= MAX_PROFILE_BYTES:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        count -= 1
+        total -= size
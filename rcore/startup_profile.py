@@ -0,0 +1,249 @@
+# Copyright (c) 2026 RokctAI
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Copyright (c) 2026, Rokct Intelligence (pty) Ltd.
+# For license information, please see license.txt
+
+"""
+Cold-start profile of the rcore app.
+
+Runs a fresh interpreter under `python -X importtime`, times importing
+frappe, initialising the site, importing rcore.hooks and resolving every
+dotted path the hooks declare, and reports the cumulative import time of
+each rcore module. Third-party modules that an rcore module pulls in at
+import time and that cost more than a threshold are flagged as candidates
+for lazy imports. Totals can be saved as a baseline and later runs compared
+against it.
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+import frappe
+
+BASELINE_FILE = "rcore_startup_baseline.json"
+
+DEFAULT_RUNS = 3
+# Third-party imports first triggered by an rcore module above this are flagged
+DEFAULT_HEAVY_IMPORT_MS = 20
+# Allowed slowdown against the baseline before a run counts as a regression
+DEFAULT_TOLERANCE = 0.2
+
+# Executed in a child interpreter; prints a JSON timing summary on stdout
+# while -X importtime writes the import tree to stderr.
+STARTUP_SCRIPT = """
+import json, sys, time
+
+timings = {}
+start = time.perf_counter()
+import frappe
+timings["import_frappe"] = time.perf_counter() - start
+
+mark = time.perf_counter()
+frappe.init(site=sys.argv[1])
+timings["init_site"] = time.perf_counter() - mark
+
+mark = time.perf_counter()
+import rcore.hooks
+timings["import_hooks"] = time.perf_counter() - mark
+
+mark = time.perf_counter()
+hooks = frappe.get_hooks(app_name="rcore")
+timings["load_hooks"] = time.perf_counter() - mark
+
+def dotted_paths(value):
+    if isinstance(value, str):
+        if value.startswith("rcore.") and "." in value[6:]:
+            yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from dotted_paths(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from dotted_paths(item)
+
+resolved = {}
+mark = time.perf_counter()
+for path in sorted(set(dotted_paths(dict(hooks)))):
+    begin = time.perf_counter()
+    try:
+        frappe.get_attr(path)
+    except Exception as e:
+        resolved[path] = repr(e)
+        continue
+    resolved[path] = time.perf_counter() - begin
+timings["resolve_hooks"] = time.perf_counter() - mark
+timings["total"] = time.perf_counter() - start
+
+frappe.destroy()
+print(json.dumps({"timings": timings, "resolved": resolved}))
+"""
+
+
+def profile_startup(site, runs=DEFAULT_RUNS, heavy_import_ms=DEFAULT_HEAVY_IMPORT_MS):
+    """
+    Profile rcore's cold start `runs` times in fresh interpreters and return
+    a report dict: median phase timings, per-hook resolution times, rcore
+    module import times and flagged heavy imports (all in milliseconds).
+    """
+    samples = []
+    import_tree = None
+    resolved = {}
+    for _ in range(max(1, runs)):
+        result, importtime = _run_child(site)
+        samples.append(result["timings"])
+        resolved = result["resolved"]
+        if import_tree is None:
+            import_tree = parse_importtime(importtime)
+
+    timings = {
+        phase: round(statistics.median(sample[phase] for sample in samples) * 1000, 2)
+        for phase in samples[0]
+    }
+
+    return {
+        "site": site,
+        "runs": len(samples),
+        "timings": timings,
+        "hooks": {
+            path: round(value * 1000, 2) if isinstance(value, float) else value
+            for path, value in sorted(resolved.items())
+        },
+        "modules": rcore_module_times(import_tree),
+        "heavy_imports": heavy_imports(import_tree, heavy_import_ms),
+    }
+
+
+def parse_importtime(output):
+    """
+    Parse `-X importtime` output into a forest of
+    {"name", "self_ms", "cumulative_ms", "children"} nodes.
+    """
+    pending = {}
+    roots = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            self_us, cumulative_us = int(self_us), int(cumulative_us)
+        except ValueError:
+            continue
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        node = {
+            "name": name.strip(),
+            "self_ms": self_us / 1000,
+            "cumulative_ms": cumulative_us / 1000,
+            # Children are printed before their parent, one level deeper
+            "children": pending.pop(depth + 1, []),
+        }
+        if depth == 0:
+            roots.append(node)
+        else:
+            pending.setdefault(depth, []).append(node)
+    return roots
+
+
+def rcore_module_times(tree):
+    """{module: cumulative ms} for every rcore module, slowest first."""
+    times = {}
+    for node in _walk(tree):
+        if node["name"] == "rcore" or node["name"].startswith("rcore."):
+            times[node["name"]] = round(node["cumulative_ms"], 2)
+    return dict(sorted(times.items(), key=lambda item: -item[1]))
+
+
+def heavy_imports(tree, threshold_ms=DEFAULT_HEAVY_IMPORT_MS):
+    """
+    Non-rcore modules first imported at the top level of an rcore module
+    and costing at least `threshold_ms`; these are worth importing lazily.
+    """
+    flagged = []
+    for node in _walk(tree):
+        if not node["name"].startswith("rcore"):
+            continue
+        for child in node["children"]:
+            if child["name"].startswith("rcore"):
+                continue
+            if child["cumulative_ms"] >= threshold_ms:
+                flagged.append({
+                    "module": node["name"],
+                    "imports": child["name"],
+                    "cumulative_ms": round(child["cumulative_ms"], 2),
+                })
+    return sorted(flagged, key=lambda item: -item["cumulative_ms"])
+
+
+def get_baseline_path():
+    return os.path.abspath(frappe.get_site_path("private", BASELINE_FILE))
+
+
+def load_baseline():
+    try:
+        with open(get_baseline_path()) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_baseline(report):
+    path = get_baseline_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"timings": report["timings"], "modules": report["modules"]}, f, indent=1)
+    return path
+
+
+def compare_to_baseline(report, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Return [(phase, baseline_ms, current_ms, regressed)] for each phase in
+    both the report and the baseline.
+    """
+    rows = []
+    for phase, current in report["timings"].items():
+        previous = baseline.get("timings", {}).get(phase)
+        if previous is None:
+            continue
+        rows.append((phase, previous, current, current > previous * (1 + tolerance)))
+    return rows
+
+
+def _run_child(site):
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP_SCRIPT, site],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if process.returncode != 0:
+        raise frappe.ValidationError(
+            f"Startup profile run failed:\n{process.stderr[-2000:]}")
+
+    lines = process.stdout.strip().splitlines()
+    return json.loads(lines[-1]), process.stderr
+
+
+def _walk(nodes):
+    for node in nodes:
+        yield node
+        yield from _walk(node["children"])
@@ -0,0 +1,235 @@
+# Copyright (c) 2026 RokctAI
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Micro-benchmarks for rcore's hot paths.
+
+Each benchmark calls an rcore-owned endpoint in-process against a seeded
+site, recording the latency distribution and the SQL statements issued per
+call. Endpoints served from a cache are measured warm and, with the cache
+cleared before every call, cold. Results are plain JSON so a run can be
+saved as the baseline and later runs compared against it (see the
+rcore-benchmark and rcore-benchmark-compare commands).
+"""
+
+import json
+import math
+import os
+import statistics
+import time
+
+import frappe
+
+from rcore.tests.query_budget import count_queries
+
+BASELINE_FILE = "rcore_benchmark_baseline.json"
+RESULTS_FILE = "rcore_benchmark_latest.json"
+
+DEFAULT_ITERATIONS = 200
+WARMUP_ITERATIONS = 10
+# Allowed p50/p90 slowdown against the baseline
+DEFAULT_THRESHOLD = 0.25
+# Latency differences below this are noise, whatever the ratio
+MIN_REGRESSION_MS = 0.05
+
+
+def _get_version():
+    from rcore.version import get_version
+
+    return get_version
+
+
+def _get_assetlinks():
+    from rcore.api.app_links import get_assetlinks
+
+    return get_assetlinks
+
+
+def _get_apple_app_site_association():
+    from rcore.api.app_links import get_apple_app_site_association
+
+    return get_apple_app_site_association
+
+
+def _get_paas_branding_for_tenant():
+    from rcore.branding import get_paas_branding_for_tenant
+
+    return get_paas_branding_for_tenant
+
+
+def _get_paas_brand_html():
+    from rcore.branding import get_paas_brand_html
+
+    return get_paas_brand_html
+
+
+def _clear_well_known():
+    from rcore.api.app_links import get_well_known_documents
+
+    get_well_known_documents.clear()
+
+
+def _clear_branding():
+    from rcore.branding import clear_branding_cache
+
+    clear_branding_cache()
+
+
+def _alias_dispatch(alias, http_method, args):
+    """
+    A call to `alias` through Frappe's handler, as a request would make it:
+    the override lookup, the generated proxy and its checks, and the target.
+    """
+
+    def setup():
+        from frappe.handler import execute_cmd
+        from frappe.utils import set_request
+
+        set_request(method=http_method, path=f"/api/method/{alias}")
+
+        def run():
+            frappe.local.form_dict = frappe._dict(args)
+            return execute_cmd(alias)
+
+        return run
+
+    return setup
+
+
+# name -> (setup returning the callable to time, optional per-call cache reset)
+BENCHMARKS = {
+    "get_version": (_get_version, None),
+    "get_assetlinks": (_get_assetlinks, None),
+    "get_assetlinks[cold]": (_get_assetlinks, _clear_well_known),
+    "get_apple_app_site_association": (_get_apple_app_site_association, None),
+    "get_paas_branding_for_tenant": (_get_paas_branding_for_tenant, None),
+    "get_paas_branding_for_tenant[cold]": (_get_paas_branding_for_tenant, _clear_branding),
+    "get_paas_brand_html": (_get_paas_brand_html, None),
+    "get_paas_brand_html[cold]": (_get_paas_brand_html, _clear_branding),
+}
+# An empty batch: the alias path end to end with a target that has no side
+# effects
+BENCHMARKS["alias_dispatch[rokct.platform.batch]"] = (
+    _alias_dispatch("rokct.platform.batch", "POST", {"calls": "[]"}), None)
+
+
+def run_benchmarks(iterations=DEFAULT_ITERATIONS, only=None):
+    """
+    Run the benchmarks (optionally only names containing `only`) on the
+    current site and return {name: stats}. Benchmarks whose endpoint can't
+    be loaded on this site are reported with an "error" instead.
+    """
+    from frappe.utils import set_request
+
+    results = {}
+    for name, (setup, reset) in BENCHMARKS.items():
+        if only and only not in name:
+            continue
+        set_request(method="GET", path="/")
+        try:
+            fn = setup()
+            results[name] = measure(fn, iterations, reset)
+        except Exception as e:
+            frappe.db.rollback()
+            results[name] = {"error": f"{type(e).__name__}: {e}"}
+
+    return {
+        "site": frappe.local.site,
+        "iterations": iterations,
+        "timestamp": int(time.time()),
+        "benchmarks": results,
+    }
+
+
+def measure(fn, iterations=DEFAULT_ITERATIONS, reset=None):
+    """Latency percentiles (ms) and SQL statements per call for `fn`."""
+    for _ in range(WARMUP_ITERATIONS):
+        if reset:
+            reset()
+        fn()
+
+    timings = []
+    queries = 0
+    for _ in range(iterations):
+        if reset:
+            reset()
+        with count_queries() as recorder:
+            start = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - start) * 1000)
+        queries += recorder.count
+
+    timings.sort()
+    return {
+        "mean_ms": round(statistics.fmean(timings), 4),
+        "min_ms": round(timings[0], 4),
+        "p50_ms": round(percentile(timings, 50), 4),
+        "p90_ms": round(percentile(timings, 90), 4),
+        "p99_ms": round(percentile(timings, 99), 4),
+        "max_ms": round(timings[-1], 4),
+        "queries_per_call": round(queries / iterations, 2),
+    }
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Return [(name, metric, baseline, current)] for every regression: p50 or
+    p90 slower than the baseline by more than `threshold`, or more queries
+    per call.
+    """
+    regressions = []
+    for name, current in results["benchmarks"].items():
+        previous = baseline.get("benchmarks", {}).get(name)
+        if not previous or "error" in previous or "error" in current:
+            continue
+        for metric in ("p50_ms", "p90_ms"):
+            if (current[metric] > previous[metric] * (1 + threshold)
+                    and current[metric] - previous[metric] > MIN_REGRESSION_MS):
+                regressions.append((name, metric, previous[metric], current[metric]))
+        if current["queries_per_call"] > previous["queries_per_call"]:
+            regressions.append(
+                (name, "queries_per_call", previous["queries_per_call"], current["queries_per_call"]))
+    return regressions
+
+
+def get_baseline_path():
+    return os.path.abspath(frappe.get_site_path("private", BASELINE_FILE))
+
+
+def get_results_path():
+    return os.path.abspath(frappe.get_site_path("private", RESULTS_FILE))
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def save(results, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(results, f, indent=1)
+    return path
+
+
+def percentile(ordered, percent):
+    """Nearest-rank `percent`th percentile of the sorted list `ordered`."""
+    rank = min(len(ordered), max(1, math.ceil(percent / 100 * len(ordered))))
+    return ordered[rank - 1]
@@ -0,0 +1,200 @@
+# Copyright (c) 2026 RokctAI
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Snapshot/restore of the prepared test fixture state.
+
+`before_tests` builds its fixtures once and records which tables that
+build wrote to (from pg_stat_xact_user_tables, before committing). Only
+those tables are dumped with pg_dump, keyed by a hash of the fixture code,
+fixture files, hooks, applied patches, installed apps and schema. Later
+runs with the same key truncate just those tables and reload them with
+psql in one transaction, so a failed reload leaves the site as it was; the
+rest of the site is left alone. The dump holds data only, so columns for
+restored Custom Fields are re-created afterwards. A changed key
+simply builds and snapshots afresh. Set `rcore_fixture_snapshots` to 0 in
+site_config to disable.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import subprocess
+
+import frappe
+
+SNAPSHOT_DIR = "rcore_fixture_snapshots"
+
+
+def is_enabled():
+    return (
+        frappe.conf.get("rcore_fixture_snapshots", 1)
+        and frappe.conf.get("db_type") == "postgres"
+        and shutil.which("pg_dump")
+        and shutil.which("psql")
+    )
+
+
+def fixture_hash():
+    """
+    Key for the fixture state: fixture code and files, hooks, patch log,
+    installed apps and schema. Anything that can change what the fixtures
+    build, or what they build on top of, changes the key.
+    """
+    from rcore.tests import utils
+
+    digest = hashlib.sha256(inspect.getsource(utils).encode())
+
+    for app in frappe.get_installed_apps():
+        digest.update(f"{app}=={_app_version(app)}".encode())
+        fixtures_path = frappe.get_app_path(app, "fixtures")
+        if os.path.isdir(fixtures_path):
+            for entry in sorted(os.scandir(fixtures_path), key=lambda e: e.name):
+                digest.update(f"{app}/{entry.name}@{entry.stat().st_mtime_ns}".encode())
+
+    digest.update(json.dumps(frappe.get_hooks(), sort_keys=True, default=str).encode())
+
+    for patch in frappe.get_all("Patch Log", pluck="name", order_by="name asc"):
+        digest.update(f"patch|{patch}".encode())
+
+    for name, modified in frappe.db.sql(
+            "select name, modified from tabDocType order by name"):
+        digest.update(f"{name}|{modified}".encode())
+
+    return digest.hexdigest()[:20]
+
+
+def written_tables():
+    """Tables written by the current, uncommitted transaction."""
+    return frappe.db.sql(
+        """SELECT relname FROM pg_stat_xact_user_tables
+        WHERE schemaname = current_schema()
+        AND n_tup_ins + n_tup_upd + n_tup_del > 0
+        ORDER BY relname""",
+        pluck=True,
+    )
+
+
+def get_snapshot_path(key):
+    return os.path.abspath(
+        frappe.get_site_path("private", SNAPSHOT_DIR, f"{key}.sql"))
+
+
+def restore(key):
+    """Restore the snapshot for `key` if one exists; returns True on success."""
+    path = get_snapshot_path(key)
+    tables = _read_tables(key)
+    if not os.path.exists(path) or tables is None:
+        return False
+
+    if tables:
+        # Release our own locks so the truncate doesn't wait on them
+        frappe.db.commit()
+        truncate = "TRUNCATE {}".format(", ".join(f'"{table}"' for table in tables))
+        try:
+            # Truncate and reload in one transaction: if the load fails,
+            # nothing was emptied
+            _run(
+                "psql", "--single-transaction", "--set", "ON_ERROR_STOP=1",
+                "--quiet", "--command", truncate, "--file", path,
+                "--dbname", frappe.conf.db_name,
+            )
+        except subprocess.CalledProcessError as e:
+            # The fixture builders recreate whatever is missing
+            print(f"⚠️ Fixture snapshot restore failed, rebuilding: {e.stderr}")
+            return False
+
+        if "tabCustom Field" in tables:
+            _sync_custom_field_columns()
+
+    frappe.clear_cache()
+    return True
+
+
+def save(key, tables):
+    """Dump `tables` as the snapshot for `key`, replacing older snapshots."""
+    path = get_snapshot_path(key)
+    folder = os.path.dirname(path)
+    os.makedirs(folder, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+
+    if tables:
+        table_args = [arg for table in tables for arg in ("--table", f'"{table}"')]
+        try:
+            _run(
+                "pg_dump", "--format=plain", "--data-only", *table_args,
+                "--file", tmp_path, frappe.conf.db_name,
+            )
+        except subprocess.CalledProcessError as e:
+            print(f"⚠️ Could not snapshot test fixtures: {e.stderr}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return None
+        os.replace(tmp_path, path)
+    else:
+        # Everything already existed; there is nothing to reload
+        open(path, "wb").close()
+    with open(os.path.join(folder, f"{key}.json"), "w") as f:
+        json.dump({"tables": list(tables)}, f, indent=1)
+
+    for entry in os.scandir(folder):
+        if not entry.name.startswith(f"{key}."):
+            os.remove(entry.path)
+    return path
+
+
+def _sync_custom_field_columns():
+    """Add the columns behind restored Custom Field rows (e.g. on a reinstall)."""
+    for doctype in frappe.get_all("Custom Field", pluck="dt", distinct=True):
+        frappe.clear_cache(doctype=doctype)
+        frappe.db.updatedb(doctype)
+    frappe.db.commit()
+
+
+def _read_tables(key):
+    try:
+        with open(os.path.join(
+                os.path.dirname(get_snapshot_path(key)), f"{key}.json")) as f:
+            return json.load(f)["tables"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _run(*args):
+    conf = frappe.conf
+    env = dict(os.environ, PGPASSWORD=conf.db_password or "")
+    connection = [
+        "--host", conf.db_host or "localhost",
+        "--port", str(conf.db_port or 5432),
+        "--username", conf.db_user or conf.db_name,
+    ]
+    command, *rest = args
+    return subprocess.run(
+        [command, *connection, *rest],
+        env=env, capture_output=True, text=True, check=True)
+
+
+def _app_version(app):
+    try:
+        return frappe.get_attr(f"{app}.__version__")
+    except Exception:
+        return ""
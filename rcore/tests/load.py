@@ -0,0 +1,205 @@
+# Copyright (c) 2026 RokctAI
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Load-test harness replaying mobile app launch sequences over HTTP.
+
+Each virtual user opens its own session and loops through a scenario
+(by default: version check, both .well-known documents, tenant branding,
+auth refresh through the paas.* alias and a rokct.platform.api call),
+pausing a randomised think time between steps. Users start staggered
+over the ramp-up period and stop when the duration is over. The report
+gives throughput, latency percentiles and error rates per step and
+overall, to find how much load a worker configuration can take.
+
+A scenario file is a JSON list of steps:
+
+    [{"name": "branding", "method": "GET",
+      "path": "/api/method/rcore.branding.get_paas_branding_for_tenant"},
+     {"name": "refresh", "method": "POST",
+      "path": "/api/method/paas.api.auth.refresh",
+      "data": {"refresh_token": "{refresh_token}"},
+      "requires": ["refresh_token"]}]
+
+"{name}" placeholders are filled from the variables passed on the command
+line; steps whose `requires` variables are missing are skipped.
+"""
+
+import json
+import random
+import statistics
+import threading
+import time
+
+from rcore.tests.benchmarks import percentile
+
+MOBILE_LAUNCH_SCENARIO = [
+    {"name": "version", "method": "GET", "path": "/api/method/rcore.version.get_version"},
+    {"name": "assetlinks", "method": "GET", "path": "/.well-known/assetlinks.json"},
+    {"name": "apple_app_site_association", "method": "GET",
+     "path": "/.well-known/apple-app-site-association"},
+    {"name": "branding", "method": "GET",
+     "path": "/api/method/rcore.branding.get_paas_branding_for_tenant"},
+    {"name": "auth_refresh", "method": "POST", "path": "/api/method/paas.api.auth.refresh",
+     "data": {"refresh_token": "{refresh_token}"}, "requires": ["refresh_token"]},
+    {"name": "platform_api", "method": "POST", "path": "/api/method/rokct.platform.api",
+     "json": "{platform_payload}", "requires": ["platform_payload"]},
+]
+
+REQUEST_TIMEOUT = 30
+
+
+class LoadTest:
+    def __init__(self, base_url, scenario=None, users=10, duration=60, ramp_up=10,
+                 think_time=1.0, variables=None, headers=None):
+        self.base_url = base_url.rstrip("/")
+        self.users = max(1, users)
+        self.duration = duration
+        self.ramp_up = ramp_up
+        self.think_time = think_time
+        self.variables = variables or {}
+        self.headers = headers or {}
+        self.steps, self.skipped = [], []
+        for step in scenario or MOBILE_LAUNCH_SCENARIO:
+            if all(self.variables.get(name) for name in step.get("requires", ())):
+                self.steps.append(step)
+            else:
+                self.skipped.append(step["name"])
+        self.samples = {step["name"]: [] for step in self.steps}
+        self.errors = {step["name"]: {} for step in self.steps}
+        self.iterations = 0
+        self._lock = threading.Lock()
+        self._deadline = None
+
+    def run(self):
+        """Run the test and return the report dict."""
+        start = time.monotonic()
+        self._deadline = start + self.ramp_up + self.duration
+        threads = [
+            threading.Thread(target=self._user, args=(index,), daemon=True)
+            for index in range(self.users)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        return self.report(time.monotonic() - start)
+
+    def _user(self, index):
+        import requests
+
+        time.sleep(self.ramp_up * index / self.users)
+        session = requests.Session()
+        session.headers.update(self.headers)
+
+        while time.monotonic() < self._deadline:
+            for step in self.steps:
+                if time.monotonic() >= self._deadline:
+                    return
+                self._request(session, step)
+                if self.think_time:
+                    time.sleep(random.uniform(0.5, 1.5) * self.think_time)
+            with self._lock:
+                self.iterations += 1
+
+    def _request(self, session, step):
+        kwargs = {"timeout": REQUEST_TIMEOUT}
+        if "data" in step:
+            kwargs["data"] = self._fill(step["data"])
+        if "json" in step:
+            payload = self._fill(step["json"])
+            kwargs["json"] = json.loads(payload) if isinstance(payload, str) else payload
+
+        error = None
+        start = time.perf_counter()
+        try:
+            response = session.request(step.get("method", "GET"), self.base_url + step["path"], **kwargs)
+            if response.status_code >= 400:
+                error = str(response.status_code)
+        except Exception as e:
+            error = type(e).__name__
+        elapsed = (time.perf_counter() - start) * 1000
+
+        with self._lock:
+            self.samples[step["name"]].append(elapsed)
+            if error:
+                counts = self.errors[step["name"]]
+                counts[error] = counts.get(error, 0) + 1
+
+    def _fill(self, value):
+        if isinstance(value, str):
+            for name, replacement in self.variables.items():
+                value = value.replace("{" + name + "}", str(replacement))
+            return value
+        if isinstance(value, dict):
+            return {key: self._fill(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._fill(item) for item in value]
+        return value
+
+    def report(self, elapsed):
+        steps = {}
+        for name, samples in self.samples.items():
+            steps[name] = _summarize(samples, self.errors[name], elapsed)
+
+        everything = [sample for samples in self.samples.values() for sample in samples]
+        errors = {}
+        for counts in self.errors.values():
+            for error, count in counts.items():
+                errors[error] = errors.get(error, 0) + count
+
+        return {
+            "base_url": self.base_url,
+            "users": self.users,
+            "duration_s": round(elapsed, 2),
+            "ramp_up_s": self.ramp_up,
+            "think_time_s": self.think_time,
+            "iterations": self.iterations,
+            "skipped_steps": self.skipped,
+            "overall": _summarize(everything, errors, elapsed),
+            "steps": steps,
+        }
+
+
+def load_scenario(path):
+    with open(path) as f:
+        scenario = json.load(f)
+    if not isinstance(scenario, list) or not all("name" in s and "path" in s for s in scenario):
+        raise ValueError("A scenario must be a list of steps with a name and a path")
+    return scenario
+
+
+def _summarize(samples, errors, elapsed):
+    if not samples:
+        return {"requests": 0}
+    ordered = sorted(samples)
+    error_count = sum(errors.values())
+    return {
+        "requests": len(ordered),
+        "throughput_rps": round(len(ordered) / elapsed, 2) if elapsed else None,
+        "error_rate": round(error_count / len(ordered), 4),
+        "errors": errors,
+        "mean_ms": round(statistics.fmean(ordered), 2),
+        "p50_ms": round(percentile(ordered, 50), 2),
+        "p90_ms": round(percentile(ordered, 90), 2),
+        "p99_ms": round(percentile(ordered, 99), 2),
+        "max_ms": round(ordered[-1], 2),
+    }
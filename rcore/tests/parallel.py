@@ -0,0 +1,260 @@
+# Copyright (c) 2026 RokctAI
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Parallel, sharded rcore test runs.
+
+The prepared test site (fixtures from before_tests) is cloned once per
+worker with `createdb --template`, test modules are sharded across workers
+by their historical durations (longest first onto the least loaded
+worker), and each worker runs its modules with `bench run-tests` against
+its own clone. JUnit results, module durations and, optionally, coverage
+data are merged at the end.
+"""
+
+import heapq
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+
+import frappe
+
+DURATIONS_FILE = "rcore_test_durations.json"
+# site_config flag marking a worker clone; rcore.fleet skips these sites
+CLONE_FLAG = "rcore_test_clone"
+# Assumed duration for modules with no history
+DEFAULT_DURATION = 10.0
+
+
+def discover_test_modules(app="rcore"):
+    """Dotted names of every test_*.py module in the app."""
+    app_path = frappe.get_app_path(app)
+    root = os.path.dirname(app_path)
+    modules = []
+    for dirpath, dirnames, filenames in os.walk(app_path):
+        dirnames[:] = [d for d in dirnames if not d.startswith((".", "__"))]
+        for filename in filenames:
+            if filename.startswith("test_") and filename.endswith(".py"):
+                relative = os.path.relpath(os.path.join(dirpath, filename[:-3]), root)
+                modules.append(relative.replace(os.sep, "."))
+    return sorted(modules)
+
+
+def shard(modules, workers, durations=None):
+    """Split modules into `workers` shards of roughly equal total duration."""
+    durations = durations or {}
+    known = [durations[m] for m in modules if m in durations]
+    fallback = sum(known) / len(known) if known else DEFAULT_DURATION
+
+    shards = [(0.0, index, []) for index in range(max(1, workers))]
+    heapq.heapify(shards)
+    for module in sorted(modules, key=lambda m: -durations.get(m, fallback)):
+        total, index, assigned = heapq.heappop(shards)
+        assigned.append(module)
+        heapq.heappush(shards, (total + durations.get(module, fallback), index, assigned))
+
+    return [assigned for _, _, assigned in sorted(shards, key=lambda item: item[1]) if assigned]
+
+
+def load_durations():
+    try:
+        with open(_durations_path()) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_durations(durations):
+    path = _durations_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(dict(sorted(durations.items())), f, indent=1)
+
+
+def clone_site(site, clone, root_login, root_password):
+    """
+    Create `clone` as a copy of `site`'s database and site config. The clone
+    has its scheduler paused and is flagged so fleet rollouts skip it.
+    """
+    conf = frappe.get_site_config(sites_path=".", site_path=site)
+    owner = conf.get("db_user") or conf["db_name"]
+
+    _pg(conf, root_login, root_password, "dropdb", "--if-exists", clone)
+    _pg(conf, root_login, root_password, "createdb", "--template", conf["db_name"], "--owner", owner, clone)
+
+    # Copy only the site's own config; common_site_config still applies
+    with open(os.path.join(site, "site_config.json")) as f:
+        site_config = json.load(f)
+
+    for folder in ("logs", "locks", os.path.join("private", "files"), os.path.join("public", "files")):
+        os.makedirs(os.path.join(clone, folder), exist_ok=True)
+    with open(os.path.join(clone, "site_config.json"), "w") as f:
+        json.dump({
+            **site_config,
+            "db_name": clone,
+            "db_user": owner,
+            "pause_scheduler": 1,
+            CLONE_FLAG: 1,
+        }, f, indent=1)
+
+
+def drop_clone(site, clone, root_login, root_password):
+    conf = frappe.get_site_config(sites_path=".", site_path=site)
+    _pg(conf, root_login, root_password, "dropdb", "--if-exists", clone)
+    shutil.rmtree(clone, ignore_errors=True)
+
+
+def run_shard(clone, modules, output_dir, coverage=False):
+    """Run `modules` one by one against `clone`; returns {module: result}."""
+    results = {}
+    for module in modules:
+        junit_path = os.path.join(output_dir, f"{module}.xml")
+        command = [
+            sys.executable, "-m", "frappe.utils.bench_helper", "frappe",
+            "--site", clone, "run-tests", "--app", "rcore", "--module", module,
+            "--skip-before-tests", "--junit-xml-output", junit_path,
+        ]
+        if coverage:
+            command = [
+                sys.executable, "-m", "coverage", "run", "--parallel-mode",
+                f"--data-file={os.path.join(output_dir, '.coverage')}",
+                "--source", frappe.get_app_path("rcore"),
+            ] + command[1:]
+
+        start = time.monotonic()
+        process = subprocess.run(command, capture_output=True, text=True, check=False)
+        results[module] = {
+            "duration": time.monotonic() - start,
+            "returncode": process.returncode,
+            "junit": junit_path if os.path.exists(junit_path) else None,
+            "output": process.stdout[-5000:] + process.stderr[-5000:],
+        }
+    return results
+
+
+def run_parallel(site, workers, root_login, root_password, coverage=False,
+                 junit_output=None, keep_sites=False):
+    """
+    Prepare `site`, clone it per worker, run the sharded suite and return
+    the merged summary.
+    """
+    frappe.init(site=site)
+    frappe.connect()
+    try:
+        # The context `bench run-tests` prepares fixtures in
+        frappe.flags.in_test = True
+        frappe.set_user("Administrator")
+        modules = discover_test_modules()
+        durations = load_durations()
+        frappe.get_attr("rcore.tests.utils.before_tests")()
+        frappe.db.commit()
+    finally:
+        frappe.destroy()
+
+    shards = shard(modules, workers, durations)
+    clones = [f"{site}-rcore-test-{index}" for index in range(len(shards))]
+    output_dir = os.path.abspath(os.path.join(site, "private", "rcore_parallel_tests"))
+    shutil.rmtree(output_dir, ignore_errors=True)
+    os.makedirs(output_dir)
+
+    results = {}
+    try:
+        for clone in clones:
+            clone_site(site, clone, root_login, root_password)
+
+        with ThreadPoolExecutor(max_workers=len(shards) or 1) as pool:
+            for shard_results in pool.map(
+                    lambda args: run_shard(args[0], args[1], output_dir, coverage),
+                    zip(clones, shards)):
+                results.update(shard_results)
+    finally:
+        if not keep_sites:
+            for clone in clones:
+                drop_clone(site, clone, root_login, root_password)
+
+    frappe.init(site=site)
+    try:
+        durations.update({module: round(result["duration"], 2) for module, result in results.items()})
+        save_durations(durations)
+    finally:
+        frappe.destroy()
+
+    summary = merge_junit([r["junit"] for r in results.values() if r["junit"]], junit_output)
+    summary["shards"] = shards
+    summary["failed_modules"] = sorted(m for m, r in results.items() if r["returncode"] != 0)
+    summary["results"] = results
+    if coverage:
+        summary["coverage"] = combine_coverage(output_dir)
+    return summary
+
+
+def merge_junit(paths, output=None):
+    """Sum the JUnit reports in `paths`, optionally writing one combined file."""
+    combined = ET.Element("testsuites")
+    totals = {"tests": 0, "failures": 0, "errors": 0, "skipped": 0, "time": 0.0}
+    for path in paths:
+        root = ET.parse(path).getroot()
+        suites = [root] if root.tag == "testsuite" else list(root)
+        for suite in suites:
+            combined.append(suite)
+            for key in totals:
+                totals[key] += type(totals[key])(float(suite.get(key, 0) or 0))
+
+    for key, value in totals.items():
+        combined.set(key, str(round(value, 3) if isinstance(value, float) else value))
+    if output:
+        ET.ElementTree(combined).write(output, encoding="utf-8", xml_declaration=True)
+    return totals
+
+
+def combine_coverage(output_dir):
+    """Combine per-module coverage data; returns the total percentage."""
+    try:
+        import coverage
+    except ImportError:
+        return None
+
+    cov = coverage.Coverage(data_file=os.path.join(output_dir, ".coverage"))
+    cov.combine([output_dir])
+    cov.save()
+    with open(os.devnull, "w") as devnull:
+        return round(cov.report(file=devnull), 2)
+
+
+def _durations_path():
+    return os.path.abspath(frappe.get_site_path("private", DURATIONS_FILE))
+
+
+def _pg(conf, root_login, root_password, command, *args):
+    env = dict(os.environ, PGPASSWORD=root_password or "")
+    subprocess.run(
+        [
+            command,
+            "--host", conf.get("db_host") or "localhost",
+            "--port", str(conf.get("db_port") or 5432),
+            "--username", root_login,
+            *args,
+        ],
+        env=env, capture_output=True, text=True, check=True)
@@ -0,0 +1,190 @@
+# Copyright (c) 2026 RokctAI
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Copyright (c) 2026, Rokct Intelligence (pty) Ltd.
+# For license information, please see license.txt
+
+"""
+Query budgets for tests.
+
+`count_queries()` records every SQL statement issued through frappe.db.sql
+inside a block; `assert_query_budget()` and the `query_budget` decorator
+fail when a block goes over its allowance, naming the statements (and the
+rcore code that issued them) that were repeated the most:
+
+    with assert_query_budget(2, label="get_paas_branding_for_tenant"):
+        get_paas_branding_for_tenant()
+
+    with assert_query_budget(5, rows=len(products), per=1000):
+        seeder.seed_products()
+"""
+
+import functools
+import math
+import re
+import time
+import traceback
+from collections import Counter
+from contextlib import contextmanager
+
+import frappe
+
+# Transaction control is not what a budget is about
+IGNORED_PREFIXES = ("savepoint", "release savepoint", "rollback", "commit", "begin", "start transaction")
+
+# Statements listed in a failure report
+REPORT_LIMIT = 10
+
+_LITERAL_PATTERN = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+_active = []
+
+
+class QueryRecorder:
+    """Statements recorded by `count_queries`."""
+
+    def __init__(self, ignore_transactions=True):
+        self.ignore_transactions = ignore_transactions
+        self.queries = []
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    def record(self, query, duration):
+        statement = str(query).strip()
+        if self.ignore_transactions and statement.lower().startswith(IGNORED_PREFIXES):
+            return
+        self.queries.append({
+            "statement": statement,
+            "duration_ms": round(duration * 1000, 3),
+            "caller": _caller(),
+        })
+
+    def summary(self, limit=REPORT_LIMIT):
+        """[(normalized statement, count, first caller)] most repeated first."""
+        counts = Counter()
+        callers = {}
+        for query in self.queries:
+            shape = normalize(query["statement"])
+            counts[shape] += 1
+            callers.setdefault(shape, query["caller"])
+        return [(shape, count, callers[shape]) for shape, count in counts.most_common(limit)]
+
+    def report(self, limit=REPORT_LIMIT):
+        lines = []
+        for shape, count, caller in self.summary(limit):
+            lines.append(f"  {count:>5} x {shape[:200]}")
+            if caller:
+                lines.append(f"          at {caller}")
+        return "\n".join(lines)
+
+
+def normalize(statement):
+    """Collapse literals and whitespace so repeated statements group together."""
+    statement = _LITERAL_PATTERN.sub("?", statement)
+    return _WHITESPACE_PATTERN.sub(" ", statement).strip()
+
+
+@contextmanager
+def count_queries(ignore_transactions=True):
+    """Record the SQL statements issued inside the block."""
+    recorder = QueryRecorder(ignore_transactions)
+    db = frappe.local.db
+    restore = _patch(db)
+    _active.append(recorder)
+    try:
+        yield recorder
+    finally:
+        _active.remove(recorder)
+        restore()
+
+
+@contextmanager
+def assert_query_budget(max_queries, rows=None, per=1000, label=None):
+    """
+    Fail if the block issues more than `max_queries` statements. With
+    `rows`, the budget is `max_queries` for every `per` rows processed.
+    """
+    budget = max_queries
+    if rows is not None:
+        budget = max_queries * max(1, math.ceil(rows / per))
+
+    with count_queries() as recorder:
+        yield recorder
+
+    if recorder.count > budget:
+        name = f"{label}: " if label else ""
+        allowance = f"{budget}" if rows is None else f"{budget} ({max_queries} per {per} rows, {rows} rows)"
+        raise AssertionError(
+            f"{name}{recorder.count} queries issued, budget is {allowance}. "
+            f"Most repeated:\n{recorder.report()}")
+
+
+def query_budget(max_queries, rows=None, per=1000):
+    """Decorator form of `assert_query_budget` for test methods."""
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with assert_query_budget(max_queries, rows=rows, per=per, label=fn.__qualname__):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _patch(db):
+    """Route db.sql through the active recorders; returns an undo callable."""
+    if getattr(db.sql, "_rcore_query_budget", False):
+        # An enclosing block already patched this connection
+        return lambda: None
+
+    original_sql = db.sql
+    instance_sql = vars(db).get("sql")
+
+    def counted_sql(query, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return original_sql(query, *args, **kwargs)
+        finally:
+            duration = time.perf_counter() - start
+            for recorder in _active:
+                recorder.record(query, duration)
+
+    def restore():
+        if instance_sql is None:
+            vars(db).pop("sql", None)
+        else:
+            db.sql = instance_sql
+
+    counted_sql._rcore_query_budget = True
+    db.sql = counted_sql
+    return restore
+
+
+def _caller():
+    """The innermost rcore frame (outside this module) that issued the query."""
+    for frame in reversed(traceback.extract_stack()[:-3]):
+        if "/rcore/" in frame.filename and not frame.filename.endswith("query_budget.py"):
+            return f"{frame.filename.rsplit('/rcore/', 1)[-1]}:{frame.lineno} in {frame.name}"
+    return None
@@ -0,0 +1,115 @@
+# Copyright (c) 2026 RokctAI
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import set_request
+
+import rcore
+from rcore.api.batch import execute_batch
+from rcore.version import get_version
+
+
+class TestBatch(FrappeTestCase):
+    def setUp(self):
+        set_request(method="POST", path="/api/method/rcore.api.batch.execute_batch")
+
+    def run_batch(self, calls, parallel=0):
+        response = execute_batch(calls=json.dumps(calls), parallel=parallel)
+        return {result["id"]: result for result in response["results"]}
+
+    def test_serial_calls(self):
+        results = self.run_batch([
+            {"id": "version", "method": "rcore.version.get_version"},
+            {"id": "missing", "method": "rcore.version.does_not_exist"},
+        ])
+
+        self.assertEqual(results["version"]["status"], "ok")
+        self.assertEqual(results["version"]["data"], get_version())
+        self.assertEqual(results["missing"]["status"], "error")
+
+    def test_request_is_restored(self):
+        request = frappe.local.request
+        self.run_batch([{"id": "version", "method": "rcore.version.get_version"}])
+        self.assertIs(frappe.local.request, request)
+
+    def test_get_only_endpoint(self):
+        results = self.run_batch([
+            {"id": "get", "method": "rcore.version.get_version_manifest", "http_method": "GET"},
+            {"id": "post", "method": "rcore.version.get_version_manifest", "http_method": "POST"},
+        ])
+
+        self.assertEqual(results["get"]["status"], "ok")
+        self.assertEqual(results["get"]["data"]["app_version"], rcore.__version__)
+        self.assertEqual(results["post"]["status"], "error")
+
+    def test_read_only_calls_default_to_get(self):
+        results = self.run_batch([
+            {"id": "manifest", "method": "rcore.version.get_version_manifest", "read_only": 1},
+        ])
+        self.assertEqual(results["manifest"]["status"], "ok")
+
+    def test_parallel_calls(self):
+        calls = [
+            {"id": index, "method": "rcore.version.get_version_manifest", "read_only": 1}
+            for index in range(3)
+        ]
+        calls.append({"id": "serial", "method": "rcore.version.get_version"})
+
+        results = self.run_batch(calls, parallel=1)
+
+        for index in range(3):
+            self.assertEqual(results[index]["status"], "ok", results[index])
+            self.assertEqual(results[index]["data"]["app_version"], rcore.__version__)
+        self.assertEqual(results["serial"]["status"], "ok")
+
+    def test_invalid_http_method(self):
+        with self.assertRaises(frappe.ValidationError):
+            self.run_batch([{"method": "rcore.version.get_version", "http_method": "FETCH"}])
+
+    def test_guest_batches_run_serially(self):
+        frappe.set_user("Guest")
+        self.addCleanup(frappe.set_user, "Administrator")
+
+        with patch("rcore.api.batch._run_isolated") as run_isolated:
+            results = self.run_batch([
+                {"id": "manifest", "method": "rcore.version.get_version_manifest", "read_only": 1},
+            ], parallel=1)
+
+        run_isolated.assert_not_called()
+        self.assertEqual(results["manifest"]["status"], "ok")
+
+    def test_conditional_headers_are_not_forwarded(self):
+        from rcore.version import _get_manifest
+
+        set_request(
+            method="POST",
+            path="/api/method/rcore.api.batch.execute_batch",
+            headers={"If-None-Match": f'"{_get_manifest().etag}"'},
+        )
+        results = self.run_batch([
+            {"id": "manifest", "method": "rcore.version.get_version_manifest", "read_only": 1},
+        ])
+
+        self.assertEqual(results["manifest"]["status"], "ok")
+        self.assertEqual(results["manifest"]["data"]["app_version"], rcore.__version__)
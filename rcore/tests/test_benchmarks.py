@@ -0,0 +1,41 @@
+# Copyright (c) 2026 RokctAI
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from frappe.tests.utils import FrappeTestCase
+
+from rcore.tests.benchmarks import percentile
+
+
+class TestPercentile(FrappeTestCase):
+    def test_nearest_rank(self):
+        self.assertEqual(percentile([1, 2, 3, 4, 5], 50), 3)
+        self.assertEqual(percentile([1, 2, 3, 4], 50), 2)
+        self.assertEqual(percentile([1, 2, 3, 4, 5], 90), 5)
+        self.assertEqual(percentile([1, 2, 3, 4, 5], 0), 1)
+        self.assertEqual(percentile([1, 2, 3, 4, 5], 100), 5)
+
+    def test_tail_is_not_under_reported(self):
+        ordered = list(range(1, 151))
+        self.assertEqual(percentile(ordered, 99), 149)
+        self.assertEqual(percentile(list(range(1, 11)), 99), 10)
+
+    def test_single_sample(self):
+        self.assertEqual(percentile([7], 50), 7)
+        self.assertEqual(percentile([7], 99), 7)
@@ -0,0 +1,119 @@
+# Copyright (c) 2026 RokctAI
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import contextvars
+import threading
+import time
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from rcore import caching
+from rcore.caching import cached, invalidate_doc_caches
+
+
+class TestCached(FrappeTestCase):
+    def setUp(self):
+        self.calls = []
+
+        @cached("rcore_test_cached", invalidate_on=("ToDo",))
+        def compute(value):
+            self.calls.append(value)
+            return value * 2
+
+        self.compute = compute
+        compute.clear()
+        self.addCleanup(compute.clear)
+
+    def hold_lock(self, *args):
+        """Take the recompute lock for `args` as another worker would."""
+        cache = frappe.cache()
+        full_key = f"{caching.CACHE_KEY_PREFIX}|rcore_test_cached|{(args, [])}"
+        lock_key = cache.make_key(f"{full_key}|lock")
+        failed_key = cache.make_key(f"{full_key}|failed")
+        cache.set(lock_key, 1, ex=caching.LOCK_TIMEOUT)
+        self.addCleanup(cache.delete, lock_key, failed_key)
+        return lock_key, failed_key
+
+    def test_caches_value(self):
+        self.assertEqual(self.compute(2), 4)
+        self.assertEqual(self.compute(2), 4)
+        self.assertEqual(self.calls, [2])
+
+    def test_waits_for_lock_holder(self):
+        self.hold_lock(3)
+        # The other worker stores its result while we wait
+        context = contextvars.copy_context()
+        timer = threading.Timer(0.3, context.run, args=(self.compute.prime, 6, 3))
+        timer.start()
+        self.addCleanup(timer.cancel)
+
+        self.assertEqual(self.compute(3), 6)
+        self.assertEqual(self.calls, [])
+
+    def test_waits_while_lock_is_held(self):
+        self.hold_lock(4)
+
+        start = time.monotonic()
+        with patch.object(caching, "LOCK_TIMEOUT", 0.5):
+            self.assertEqual(self.compute(4), 8)
+
+        # Single flight: no recompute until the holder's lock times out
+        self.assertGreaterEqual(time.monotonic() - start, 0.5)
+        self.assertEqual(self.calls, [4])
+
+    def test_failure_marker_releases_waiters(self):
+        _lock_key, failed_key = self.hold_lock(5)
+        frappe.cache().set(failed_key, 1, ex=caching.FAILURE_MARKER_TTL)
+
+        start = time.monotonic()
+        self.assertEqual(self.compute(5), 10)
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(self.calls, [5])
+
+    def test_failed_compute_sets_marker(self):
+        @cached("rcore_test_cached_failing")
+        def failing():
+            raise ValueError
+
+        with self.assertRaises(ValueError):
+            failing()
+
+        cache = frappe.cache()
+        full_key = f"{caching.CACHE_KEY_PREFIX}|rcore_test_cached_failing|{((), [])}"
+        self.assertTrue(cache.get(cache.make_key(f"{full_key}|failed")))
+        self.assertIsNone(cache.get(cache.make_key(f"{full_key}|lock")))
+
+    def test_invalidated_after_commit(self):
+        self.compute(6)
+        invalidate_doc_caches(frappe._dict(doctype="ToDo"))
+        self.assertEqual(self.compute.peek(6), 12)
+
+        frappe.db.commit()
+        self.assertIsNone(self.compute.peek(6))
+
+    def test_not_invalidated_on_rollback(self):
+        self.compute(7)
+        invalidate_doc_caches(frappe._dict(doctype="ToDo"))
+
+        frappe.db.rollback()
+        self.assertEqual(self.compute.peek(7), 14)
+        self.assertFalse(frappe.local.rcore_pending_invalidations)
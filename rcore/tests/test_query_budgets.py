@@ -0,0 +1,119 @@
+# Copyright (c) 2026 RokctAI
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+
+import frappe
+from frappe.handler import execute_cmd
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import set_request
+
+from rcore.api.app_links import (
+    get_apple_app_site_association,
+    get_assetlinks,
+    get_well_known_documents,
+)
+from rcore.api.batch import execute_batch
+from rcore.branding import (
+    clear_branding_cache,
+    get_paas_branding_for_tenant,
+    get_paas_branding_for_tenants,
+)
+from rcore.entitlements import clear_entitlements, get_company_modules, has_module
+from rcore.tests.query_budget import assert_query_budget
+
+TEST_COMPANY = "_Test Company"
+
+
+class TestQueryBudgets(FrappeTestCase):
+    """SQL statements the cached hot paths may issue, warm and cold."""
+
+    def require_doctypes(self, *doctypes):
+        for doctype in doctypes:
+            if not frappe.db.exists("DocType", doctype):
+                self.skipTest(f"{doctype} is not installed on this site")
+
+    def test_tenant_branding(self):
+        self.require_doctypes("Settings", "Company Subscription", "Subscription Plan")
+        set_request(method="GET", path="/api/method/rcore.branding.get_paas_branding_for_tenant")
+
+        clear_branding_cache()
+        with assert_query_budget(5, label="branding (cold)"):
+            get_paas_branding_for_tenant()
+
+        with assert_query_budget(0, label="branding (warm)"):
+            get_paas_branding_for_tenant()
+
+    def test_tenants_branding_batch(self):
+        self.require_doctypes("Settings", "Company Subscription", "Subscription Plan")
+        companies = [TEST_COMPANY] + [f"_Test Branding Company {i}" for i in range(20)]
+
+        # One entitlement query and one Settings read, whatever the count
+        clear_branding_cache()
+        with assert_query_budget(5, label="branding batch (cold)"):
+            get_paas_branding_for_tenants(json.dumps(companies))
+
+        with assert_query_budget(0, label="branding batch (warm)"):
+            get_paas_branding_for_tenants(json.dumps(companies))
+
+    def test_entitlements(self):
+        self.require_doctypes("Company Subscription", "Subscription Plan")
+
+        clear_entitlements()
+        with assert_query_budget(2, label="entitlements (cold)"):
+            get_company_modules(TEST_COMPANY)
+
+        with assert_query_budget(0, label="entitlements (warm)"):
+            for _ in range(10):
+                has_module(TEST_COMPANY, "PaaS")
+                get_company_modules(TEST_COMPANY)
+
+    def test_well_known(self):
+        self.require_doctypes("Flutter App Configuration")
+        set_request(method="GET", path="/.well-known/assetlinks.json")
+
+        get_well_known_documents.clear()
+        with assert_query_budget(5, label="well-known (cold)"):
+            get_assetlinks()
+
+        with assert_query_budget(0, label="well-known (warm)"):
+            get_assetlinks()
+            get_apple_app_site_association()
+
+    def test_alias_dispatch(self):
+        set_request(method="POST", path="/api/method/rokct.platform.batch")
+        frappe.local.form_dict = frappe._dict(calls="[]")
+
+        with assert_query_budget(0, label="rokct.platform.batch"):
+            response = execute_cmd("rokct.platform.batch")
+
+        self.assertEqual(response, {"results": []})
+
+    def test_batch(self):
+        set_request(method="POST", path="/api/method/rcore.api.batch.execute_batch")
+        calls = [
+            {"id": index, "method": "rcore.version.get_version"} for index in range(10)
+        ]
+
+        # Per-call savepoints are transaction control, not queries
+        with assert_query_budget(0, label="execute_batch"):
+            response = execute_batch(calls=json.dumps(calls))
+
+        self.assertTrue(all(result["status"] == "ok" for result in response["results"]))
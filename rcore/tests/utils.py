@@ -24,7 +24,36 @@ import frappe
 def before_tests():
     """
     Setup required data before running tests.
+
+    The tables the fixtures write are snapshotted once per fixture/schema
+    hash and reloaded in one step on later runs (see
+    rcore.tests.fixture_snapshot).
     """
+    from rcore.tests import fixture_snapshot
+
+    if not fixture_snapshot.is_enabled():
+        create_fixtures()
+        return
+
+    key = fixture_snapshot.fixture_hash()
+    if fixture_snapshot.restore(key):
+        print(f"Test fixtures restored from snapshot {key}.")
+        return
+
+    # Start a fresh transaction so only the fixture build's writes count
+    frappe.db.commit()
+    build_fixtures()
+    tables = fixture_snapshot.written_tables()
+    finish_fixtures()
+    fixture_snapshot.save(key, tables)
+
+
+def create_fixtures():
+    build_fixtures()
+    finish_fixtures()
+
+
+def build_fixtures():
     create_warehouse_types()
     create_customer_groups()
     create_item_groups()
@@ -38,6 +67,9 @@ def before_tests():
     create_gender()
     create_roles()
     create_user_custom_fields()
+
+
+def finish_fixtures():
     frappe.db.commit()
     frappe.clear_cache()
     print("DEBUG: Fixtures Created. Stock Entry Types:",
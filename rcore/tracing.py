@@ -0,0 +1,360 @@
+# Copyright (c) 2026 RokctAI
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Copyright (c) 2026, Rokct Intelligence (pty) Ltd.
+# For license information, please see license.txt
+
+"""
+Lightweight request tracing.
+
+Every request adopts the caller's `x-trace-id` (or gets a fresh one), which
+is echoed back in the response. With `rcore_tracing` enabled in
+site_config, spans are recorded for the request, each DB statement, cache
+lookups and outbound calls, and exported in batches off the request path:
+to `rcore_trace_collector_url` if set, else to a rotating JSON-lines file
+in the site's logs folder. Background jobs enqueued through `enqueue`
+carry the trace id across.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+import frappe
+
+TRACE_HEADER = "x-trace-id"
+TRACE_ID_PATTERN = re.compile(r"^[A-Za-z0-9\-_.]{8,64}$")
+
+# Per-trace cap, so a runaway request can't hold unbounded spans
+MAX_SPANS_PER_TRACE = 500
+# Truncate recorded SQL to keep span records small
+MAX_STATEMENT_LENGTH = 300
+
+TRACE_FILE = "rcore_traces.jsonl"
+TRACE_FILE_MAX_BYTES = 20 * 1024 * 1024
+TRACE_FILE_BACKUPS = 5
+
+EXPORT_INTERVAL = 2
+EXPORT_BATCH_SIZE = 200
+EXPORT_QUEUE_SIZE = 10000
+
+
+class Trace:
+    def __init__(self, trace_id, record=False):
+        self.trace_id = trace_id
+        self.record = record
+        self.spans = []
+        self.root = None
+        self.query_count = 0
+        self._stack = []
+
+    def start_span(self, name, attrs=None):
+        if not self.record or len(self.spans) >= MAX_SPANS_PER_TRACE:
+            return None
+        span = {
+            "trace_id": self.trace_id,
+            "span_id": uuid.uuid4().hex[:16],
+            "parent_id": self._stack[-1]["span_id"] if self._stack else None,
+            "name": name,
+            "start": time.time(),
+            "attrs": attrs or {},
+            "_t0": time.perf_counter(),
+        }
+        self.spans.append(span)
+        self._stack.append(span)
+        return span
+
+    def end_span(self, span, **attrs):
+        if span is None:
+            return
+        span["duration_ms"] = round((time.perf_counter() - span.pop("_t0")) * 1000, 3)
+        if attrs:
+            span["attrs"].update(attrs)
+        if self._stack and self._stack[-1] is span:
+            self._stack.pop()
+        elif span in self._stack:
+            self._stack.remove(span)
+
+
+def get_trace():
+    return getattr(frappe.local, "rcore_trace", None)
+
+
+def get_trace_id():
+    """Trace id of the current request or job, if any."""
+    trace = get_trace()
+    return trace.trace_id if trace else None
+
+
+def trace_headers():
+    """Headers to propagate the current trace to an outbound call."""
+    trace_id = get_trace_id()
+    return {TRACE_HEADER: trace_id} if trace_id else {}
+
+
+@contextmanager
+def span(name, **attrs):
+    """Time a block as a child span of the current trace (no-op if off)."""
+    trace = get_trace()
+    current = trace.start_span(name, attrs) if trace else None
+    try:
+        yield current
+    except Exception as e:
+        if current is not None:
+            current["attrs"]["error"] = type(e).__name__
+        raise
+    finally:
+        if current is not None:
+            trace.end_span(current)
+
+
+def start_trace(trace_id=None, name="request", **attrs):
+    """Begin a trace for the current request or job."""
+    if not trace_id or not TRACE_ID_PATTERN.match(trace_id):
+        trace_id = uuid.uuid4().hex
+
+    trace = Trace(trace_id, record=bool(frappe.conf.get("rcore_tracing")))
+    frappe.local.rcore_trace = trace
+    trace.root = trace.start_span(name, attrs)
+    _instrument_db()
+    return trace
+
+
+def finish_trace(**attrs):
+    """End the current trace and hand its spans to the exporter."""
+    trace = get_trace()
+    if not trace:
+        return
+    frappe.local.rcore_trace = None
+    if not trace.record:
+        return
+
+    trace.end_span(trace.root, **attrs)
+    for pending in reversed(trace._stack):
+        trace.end_span(pending, unfinished=True)
+    _exporter.submit(trace.spans, _export_target())
+
+
+def before_request():
+    """before_request hook: adopt or generate the request's trace id."""
+    request = frappe.request
+    start_trace(
+        request.headers.get(TRACE_HEADER),
+        method=request.method,
+        path=request.path,
+        cmd=frappe.form_dict.get("cmd"),
+    )
+
+
+def after_request(response, request):
+    """after_request hook: echo the trace id and export recorded spans."""
+    trace_id = get_trace_id()
+    if not trace_id:
+        return
+    if response is not None:
+        response.headers["X-Trace-Id"] = trace_id
+    finish_trace(status=getattr(response, "status_code", None))
+
+
+def enqueue(method, **kwargs):
+    """
+    frappe.enqueue() that carries the current trace id into the job, so
+    the job's spans share the request's trace. The job is named after
+    `method` (not the run_traced_job wrapper) unless `job_name` is given.
+    """
+    enqueue_kwargs = {
+        key: kwargs.pop(key)
+        for key in list(kwargs)
+        if key in (
+            "queue", "timeout", "event", "is_async", "job_name", "now",
+            "enqueue_after_commit", "at_front", "job_id", "deduplicate",
+            "on_success", "on_failure",
+        )
+    }
+    enqueue_kwargs.setdefault("job_name", method)
+    return frappe.enqueue(
+        "rcore.tracing.run_traced_job",
+        job_method=method,
+        trace_id=get_trace_id(),
+        job_kwargs=kwargs,
+        **enqueue_kwargs,
+    )
+
+
+def run_traced_job(job_method, trace_id=None, job_kwargs=None):
+    """Background job entry point used by `enqueue`."""
+    if get_trace():
+        # Running inline (now=True / is_async=False) inside a traced request
+        with span("job", method=job_method):
+            return frappe.get_attr(job_method)(**(job_kwargs or {}))
+
+    start_trace(trace_id, name="job", method=job_method)
+    status = "ok"
+    try:
+        return frappe.get_attr(job_method)(**(job_kwargs or {}))
+    except Exception:
+        status = "error"
+        raise
+    finally:
+        finish_trace(status=status)
+
+
+def traced_request(method, url, **kwargs):
+    """
+    requests.request() with a span and the trace id header, for outbound
+    control-plane calls.
+    """
+    import requests
+
+    headers = {**(kwargs.pop("headers", None) or {}), **trace_headers()}
+    with span("http", method=method, url=url) as current:
+        response = requests.request(method, url, headers=headers, **kwargs)
+        if current is not None:
+            current["attrs"]["status"] = response.status_code
+        return response
+
+
+def get_query_count():
+    """Number of SQL statements issued so far in the current request/job."""
+    trace = get_trace()
+    return trace.query_count if trace else 0
+
+
+def _instrument_db():
+    """
+    Wrap this request's frappe.db.sql to count statements and, when
+    recording, turn each one into a span.
+    """
+    db = getattr(frappe.local, "db", None)
+    if db is None or getattr(db.sql, "_rcore_traced", False):
+        return
+
+    original_sql = db.sql
+
+    def traced_sql(query, *args, **kwargs):
+        trace = get_trace()
+        current = None
+        if trace:
+            trace.query_count += 1
+            if trace.record:
+                current = trace.start_span(
+                    "db", {"statement": str(query)[:MAX_STATEMENT_LENGTH]})
+        try:
+            return original_sql(query, *args, **kwargs)
+        finally:
+            if current is not None:
+                trace.end_span(current)
+
+    traced_sql._rcore_traced = True
+    db.sql = traced_sql
+
+
+def _export_target():
+    url = frappe.conf.get("rcore_trace_collector_url")
+    if url:
+        return ("http", url)
+    return ("file", os.path.abspath(frappe.get_site_path("logs", TRACE_FILE)))
+
+
+class _Exporter:
+    """Background thread that batches finished spans out of the request path."""
+
+    def __init__(self):
+        self._queue = queue.Queue(maxsize=EXPORT_QUEUE_SIZE)
+        self._thread = None
+        self._lock = threading.Lock()
+        self._file_loggers = {}
+
+    def submit(self, spans, target):
+        self._ensure_thread()
+        for record in spans:
+            try:
+                self._queue.put_nowait((target, record))
+            except queue.Full:
+                # Drop rather than block the request
+                return
+
+    def _ensure_thread(self):
+        if self._thread and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="rcore-trace-exporter", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(EXPORT_INTERVAL)
+            self.flush()
+
+    def flush(self):
+        batches = {}
+        while True:
+            try:
+                target, record = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            batches.setdefault(target, []).append(record)
+
+        for target, records in batches.items():
+            for start in range(0, len(records), EXPORT_BATCH_SIZE):
+                try:
+                    self._export(target, records[start:start + EXPORT_BATCH_SIZE])
+                except Exception:
+                    # Tracing must never take a worker down
+                    pass
+
+    def _export(self, target, records):
+        kind, destination = target
+        if kind == "http":
+            import requests
+
+            requests.post(destination, json={"spans": records}, timeout=2)
+            return
+
+        logger = self._file_loggers.get(destination)
+        if logger is None:
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            logger = logging.getLogger(f"rcore.tracing.{destination}")
+            logger.propagate = False
+            logger.setLevel(logging.INFO)
+            handler = logging.handlers.RotatingFileHandler(
+                destination,
+                maxBytes=TRACE_FILE_MAX_BYTES,
+                backupCount=TRACE_FILE_BACKUPS,
+            )
+            logger.addHandler(handler)
+            self._file_loggers[destination] = logger
+
+        logger.info("\n".join(json.dumps(record, default=str) for record in records))
+
+
+_exporter = _Exporter()
+atexit.register(_exporter.flush)
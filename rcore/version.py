@@ -22,8 +22,31 @@ from typing import Any
 # Copyright (c) 2026 ROKCT INTELLIGENCE (PTY) LTD
 # For license information, please see license.txt
 import frappe
+import hashlib
 import json
 import os
+import threading
+import time
+from collections import namedtuple
+from functools import lru_cache
+
+from werkzeug.wrappers import Response
+
+import rcore
+
+VERSIONS_FILE = os.path.join(
+    os.path.abspath(os.path.dirname(__file__)), 'versions.json')
+
+# How often (seconds) a worker re-checks versions.json's mtime; between
+# checks the manifest is served straight from memory.
+MTIME_CHECK_INTERVAL = 5
+
+# One immutable snapshot, swapped whole on reload, so a reader never pairs
+# the body of one load with the etag of another.
+Manifest = namedtuple('Manifest', ('body', 'etag', 'mtime', 'versions', 'checked_at'))
+
+_manifest_lock = threading.Lock()
+_manifest = [None]
 
 
 @frappe.whitelist(allow_guest=True)
@@ -32,12 +55,102 @@ def get_version() -> Any:
     Get version API endpoint. Reads the "rcore" key from versions.json
     (which lives alongside this file in the rcore package).
     """
-    rcore_path = os.path.abspath(os.path.dirname(__file__))
-    versions_file_path = os.path.join(rcore_path, 'versions.json')
+    return _get_manifest().versions.get('rcore', '0.1.0')  # Default fallback
+
+
+@frappe.whitelist(allow_guest=True, methods=['GET'])
+def get_version_manifest() -> Any:
+    """
+    Full version manifest: every key of versions.json (Flutter SDK, Android
+    platform, ...) plus the installed rcore app version and commit hash.
+    Served with an ETag so polling clients get 304 Not Modified.
+    """
+    manifest = _get_manifest()
+    response = Response(manifest.body, mimetype='application/json')
+    response.set_etag(manifest.etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(frappe.request)
+
+
+def _get_manifest():
+    """
+    Return the in-memory Manifest, reloading versions.json only when its
+    mtime has changed (checked at most every MTIME_CHECK_INTERVAL seconds).
+    """
+    manifest = _manifest[0]
+    now = time.monotonic()
+    if manifest is not None and now - manifest.checked_at < MTIME_CHECK_INTERVAL:
+        return manifest
 
+    with _manifest_lock:
+        manifest = _manifest[0]
+        try:
+            mtime = os.stat(VERSIONS_FILE).st_mtime_ns
+        except OSError:
+            mtime = None
+
+        if manifest is None or mtime != manifest.mtime:
+            versions = _read_versions()
+            payload = dict(versions)
+            payload['app_version'] = rcore.__version__
+            payload['commit'] = _get_commit_hash()
+            body = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+            manifest = Manifest(
+                body=body,
+                etag=hashlib.sha256(body.encode('utf-8')).hexdigest(),
+                mtime=mtime,
+                versions=versions,
+                checked_at=now,
+            )
+        else:
+            manifest = manifest._replace(checked_at=now)
+
+        _manifest[0] = manifest
+
+    return manifest
+
+
+def _read_versions():
     try:
-        with open(versions_file_path, 'r') as f:
-            versions = json.load(f)
-        return versions.get('rcore', '0.1.0')  # Default fallback
+        with open(VERSIONS_FILE, 'r') as f:
+            return json.load(f)
     except Exception:
-        return '0.1.0'  # Default fallback in case of any error
+        return {}  # Default fallback in case of any error
+
+
+@lru_cache(maxsize=1)
+def _get_commit_hash():
+    """Commit the rcore app checkout is on, read from .git without git."""
+    git_dir = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.git')
+
+    try:
+        # Worktrees/submodules point at the real git dir from a .git file
+        if os.path.isfile(git_dir):
+            with open(git_dir, 'r') as f:
+                git_dir = os.path.join(
+                    os.path.dirname(git_dir),
+                    f.read().strip().removeprefix('gitdir:').strip())
+
+        with open(os.path.join(git_dir, 'HEAD'), 'r') as f:
+            head = f.read().strip()
+        if not head.startswith('ref:'):
+            return head  # Detached HEAD
+
+        ref = head.removeprefix('ref:').strip()
+        ref_path = os.path.join(git_dir, ref)
+        if os.path.exists(ref_path):
+            with open(ref_path, 'r') as f:
+                return f.read().strip()
+
+        packed_refs = os.path.join(git_dir, 'packed-refs')
+        if os.path.exists(packed_refs):
+            with open(packed_refs, 'r') as f:
+                for line in f:
+                    parts = line.strip().split(' ')
+                    if len(parts) == 2 and parts[1] == ref:
+                        return parts[0]
+    except OSError:
+        pass
+
+    return None